@@ -137,6 +137,110 @@ class DoublyLinkedList:
         
         return temp
 
+    # Node-based operations: when the caller already holds the Node
+    # (e.g. looked it up in a hash table) there is no need to walk to an index - O(1)
+
+    def append_node(self, node):
+        node.prev = self.tail
+        node.next = None
+        if self.head is None:
+            self.head = node
+        else:
+            self.tail.next = node
+        self.tail = node
+        self.length += 1
+        return node
+
+    def remove_node(self, node):
+        # node must belong to this list
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+        node.next = None
+        node.prev = None
+        self.length -= 1
+        return node
+
+    # Sequence protocol: iteration, len(), reversed(), indexing and slicing work on values,
+    # get() and the methods above still hand out Nodes
+
+    def _empty_like(self):
+        # New empty list of the same kind
+        new_list = self.__class__(None)
+        new_list.pop_first()
+        return new_list
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        temp = self.head
+        while temp is not None:
+            yield temp.value
+            temp = temp.next
+
+    def __reversed__(self):
+        temp = self.tail
+        while temp is not None:
+            yield temp.value
+            temp = temp.prev
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            result = self._empty_like()
+            result.extend(self.__slice(index))
+            return result
+        if index < 0:
+            index += self.length
+        node = self.get(index)
+        if node is None:
+            raise IndexError("linked list index out of range")
+        return node.value
+
+    def __slice(self, index):
+        # Walks only from the nearer end to the end of the span, backwards for a negative step
+        start, stop, step = index.indices(self.length)
+        if (step > 0 and start >= stop) or (step < 0 and start <= stop):
+            return
+        temp = self.get(start)
+        for i in range(start, stop, 1 if step > 0 else -1):
+            if (i - start) % step == 0:
+                yield temp.value
+            temp = temp.next if step > 0 else temp.prev
+
+    def extend(self, values):
+        # Links the new nodes directly instead of calling append() for each value
+        if values is self:
+            values = list(values) # otherwise it would keep reading the nodes it just added
+        head = self.head
+        tail = self.tail
+        count = 0
+        for value in values:
+            new_node = Node(value)
+            if tail is None:
+                head = new_node
+            else:
+                tail.next = new_node
+                new_node.prev = tail
+            tail = new_node
+            count += 1
+        self.head = head
+        self.tail = tail
+        self.length += count
+        return True
+
+
+def check(expect, actual, message):
+    print(message)
+    print("EXPECTED:", expect)
+    print("RETURNED:", actual)
+    print("PASS" if expect == actual else "FAIL", "\n")
+
             
 # Example usage
 if __name__ == "__main__":
@@ -259,4 +363,32 @@ if __name__ == "__main__":
     
     print("\nRemoving node at index 3:")
     my_doubly_linked_list.remove(3)
-    my_doubly_linked_list.print_list()
\ No newline at end of file
+    my_doubly_linked_list.print_list()
+
+    print("\n----- Test: Sequence protocol -----\n")
+    my_doubly_linked_list = DoublyLinkedList(0)
+    my_doubly_linked_list.extend(range(1, 6))
+    check([0, 1, 2, 3, 4, 5], list(my_doubly_linked_list), "Extend and iterate:")
+    check(6, len(my_doubly_linked_list), "Length:")
+    check(5, my_doubly_linked_list.tail.value, "Tail after extend:")
+    check(4, my_doubly_linked_list.tail.prev.value, "Prev pointers after extend:")
+    check([5, 4, 3, 2, 1, 0], list(reversed(my_doubly_linked_list)), "Reversed:")
+    check((0, 3, 5, 4), (my_doubly_linked_list[0], my_doubly_linked_list[3], my_doubly_linked_list[-1], my_doubly_linked_list[-2]), "Indexing:")
+    try:
+        my_doubly_linked_list[6]
+        check(IndexError, None, "Index past the end:")
+    except IndexError:
+        check(IndexError, IndexError, "Index past the end:")
+    values = list(range(6))
+    for index in [slice(1, 4), slice(None, None, 2), slice(4, None), slice(None, None, -1), slice(5, 1, -2), slice(-2, None), slice(3, 3), slice(4, 1)]:
+        check(values[index], list(my_doubly_linked_list[index]), f"Slice {index}:")
+    sliced = my_doubly_linked_list[1:4]
+    check((DoublyLinkedList, 3, 1, 3), (type(sliced), len(sliced), sliced.head.value, sliced.tail.value), "Slice is a new DoublyLinkedList:")
+    check(3, sliced.tail.prev.next.value, "Slice prev/next pointers:")
+    my_doubly_linked_list.extend(my_doubly_linked_list)
+    check(values + values, list(my_doubly_linked_list), "Extend with itself:")
+    my_doubly_linked_list = DoublyLinkedList(1)
+    my_doubly_linked_list.pop()
+    my_doubly_linked_list.extend([7, 8])
+    check([7, 8], list(my_doubly_linked_list), "Extend an empty list:")
+    check((7, 8), (my_doubly_linked_list.head.value, my_doubly_linked_list.tail.value), "Head and tail after extending an empty list:")
@@ -1,5 +1,15 @@
 # Hash Tables
 
+import mmap
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+
 # Hashing is a process that takes input data of any size and converts it 
 # into a fixed-size string of characters (called a hash or hash value) 
 # using a mathematical function called a hash function.
@@ -25,45 +35,1089 @@
 # Setting an item: O(1)
 # Getting an item: O(1) this is assumed given a 'good' distribution 
 
+# Hash functions
+# The table only needs a function that turns a key into an int, % size picks the bucket.
+# Any of these can be passed as HashTable(hash_function=...)
+
+def sum_hash(key):
+    # The original hash: ord(letter) - Converts each character to its ASCII number (A=65, B=66, a=97, etc.)
+    # *23 - Multiplies by 23 (a prime number chosen to spread out hash values and reduce collisions)
+    # Adding the letters up means the order doesn't matter, so anagrams ("nuts"/"stun") always collide,
+    # and the sums of short keys all land in a narrow range no matter how big the table is
+    my_hash = 0
+    for letter in key:
+        my_hash = my_hash + ord(letter)*23
+    return my_hash
+
+
+FNV_OFFSET = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+
+def fnv1a_hash(key):
+    # FNV-1a (64 bit): for every byte, xor it in and multiply by a prime, so every byte
+    # changes all the bits after it and the order of the bytes matters.
+    # Unlike the built-in hash() (randomized for strings in every new Python process)
+    # it gives the same number in every process, so it's the one to use
+    # for anything written to disk or shared between processes.
+    # Slower than hash() since the loop runs in Python.
+    # Equal keys must hash the same (1 == 1.0 == True), so numbers are hashed by value,
+    # and only types with a stable byte form are accepted (no repr, it can hold a memory address)
+    if isinstance(key, str):
+        data = key.encode("utf-8")
+    elif isinstance(key, (bytes, bytearray)):
+        data = key
+    elif isinstance(key, (bool, int, float)):
+        if isinstance(key, float) and not key.is_integer():
+            data = struct.pack("<d", key)
+        else:
+            key = int(key) # True -> 1, 2.0 -> 2
+            data = key.to_bytes(key.bit_length() // 8 + 1, "little", signed = True)
+    elif key is None:
+        data = b"None"
+    elif isinstance(key, tuple):
+        data = b"".join(fnv1a_hash(item).to_bytes(8, "little") for item in key) # equal tuples have equal items
+    else:
+        raise TypeError(f"fnv1a_hash has no stable encoding for {type(key).__name__} keys")
+    my_hash = FNV_OFFSET
+    for byte in data:
+        my_hash = ((my_hash ^ byte) * FNV_PRIME) & 0xFFFFFFFFFFFFFFFF
+    return my_hash
+
+
+# Load factor = number of items / number of buckets
+# When it gets too high the buckets get long and lookups stop being O(1),
+# so the table grows (about 2x, to the next prime) once it passes max_load_factor.
+# Rehashing everything at once would make that one unlucky set_item O(n),
+# so the move is incremental: the old table is kept next to the new one and
+# every operation moves a few of its buckets over until it's empty.
+# "A few" is sized so the old table is empty before enough inserts (or removes)
+# could start the next resize, which then never has to finish this one in one go.
+
 class HashTable:
-    def __init__(self, size = 7): # set the default size to be 7 elements, prime number reduces collisions and increases ramdomnes
+    def __init__(self, size = 7, max_load_factor = 0.75, min_load_factor = 0, rehash_step = 4, hash_function = hash, sample_every = 0): # set the default size to be 7 elements, prime number reduces collisions and increases ramdomnes
+        if max_load_factor is not None and min_load_factor >= max_load_factor / 2:
+            # a grow halves the load factor, it has to land above min_load_factor or the next remove shrinks right back
+            raise ValueError(f"min_load_factor must be below max_load_factor / 2, got {min_load_factor} and {max_load_factor}")
         self.data_map = [None] * size
+        self.hash_function = hash_function # the built-in hash() is written in C, well mixed, and works for any hashable key
+        self.initial_size = size # the table never shrinks below this
+        self.max_load_factor = max_load_factor # None turns growing off (a fixed size table)
+        self.min_load_factor = min_load_factor # 0 turns shrinking off
+        self.rehash_step = rehash_step # minimum old buckets moved per operation while resizing
+        self.resize_step = rehash_step # buckets moved per operation for the resize in progress
+        self.old_map = None # the table being moved out of while a resize is in progress
+        self.rehash_index = 0 # next bucket of old_map to move
+        self.count = 0 # number of items stored
+        self.version = 0 # bumped whenever a key is added or removed or a resize starts, so iterators can tell the table changed
+        # Instrumentation, see stats()
+        self.resizes = 0 # resizes started
+        self.rehashed_items = 0 # pairs moved from an old table to a new one
+        self.sample_every = sample_every # time every Nth get/set, 0 = off
+        self.latency_samples = {"get": deque(maxlen = 1024), "set": deque(maxlen = 1024)} # most recent samples, in ns
+        self.sample_calls = {"get": 0, "set": 0}
         
-    def __hash(self, key):
-        # ord(letter) - Converts each character to its ASCII number (A=65, B=66, a=97, etc.)
-        # *23 - Multiplies by 23 (a prime number chosen to spread out hash values and reduce collisions)
-        # my_hash + - Adds to the running total from previous characters
-        # % len(self.data_map) - Modulo operation keeps the result within array bounds (0 to 6 for size 7)
-        my_hash = 0
-        for letter in key:
-            my_hash = (my_hash + ord(letter)*23) % len(self.data_map) 
-        return my_hash
+    def __hash(self, key, size = None):
+        # % size - Modulo operation keeps the result within array bounds (0 to 6 for size 7)
+        return self.hash_function(key) % (size if size is not None else len(self.data_map))
+
+    def __next_prime(self, n):
+        # Smallest prime >= n, used for the new table size
+        n = max(n, 2)
+        while any(n % d == 0 for d in range(2, int(n ** 0.5) + 1)):
+            n += 1
+        return n
+
+    def load_factor(self):
+        return self.count / len(self.data_map)
+
+    def __start_resize(self, new_size):
+        if self.old_map is not None:
+            self.__rehash_step(len(self.old_map)) # only reserve()/update() get here with a resize in progress
+        self.old_map = self.data_map
+        self.data_map = [None] * new_size
+        self.rehash_index = 0
+        self.resizes += 1
+        self.version += 1
+        # Operations until the next grow or shrink could start, the old buckets are spread over them
+        operations_left = None
+        if self.max_load_factor is not None:
+            operations_left = int(self.max_load_factor * new_size) - self.count + 1
+        if self.min_load_factor and new_size > self.initial_size:
+            removes_left = self.count - int(-(-self.min_load_factor * new_size // 1)) + 1
+            operations_left = removes_left if operations_left is None else min(operations_left, removes_left)
+        if operations_left is None:
+            self.resize_step = self.rehash_step
+        else:
+            self.resize_step = max(self.rehash_step, -(-len(self.old_map) // max(operations_left, 1)))
+
+    def __rehash_step(self, buckets):
+        # Moves the next few buckets of old_map into data_map
+        old_map = self.old_map
+        stop = min(self.rehash_index + buckets, len(old_map))
+        for i in range(self.rehash_index, stop):
+            if old_map[i] is not None:
+                for pair in old_map[i]:
+                    index = self.__hash(pair[0])
+                    if self.data_map[index] is None:
+                        self.data_map[index] = []
+                    self.data_map[index].append(pair)
+                self.rehashed_items += len(old_map[i])
+                old_map[i] = None
+        self.rehash_index = stop
+        if stop == len(old_map):
+            self.old_map = None # all moved, the old table can go
+
+    # Growing is only checked when a key is added and shrinking only when one is removed,
+    # so a grow can never be followed straight away by a shrink (or the other way round)
+
+    def __maybe_grow(self):
+        size = len(self.data_map)
+        if self.max_load_factor is not None and self.count > self.max_load_factor * size:
+            self.__start_resize(self.__next_prime(2 * size + 1))
+
+    def __maybe_shrink(self):
+        size = len(self.data_map)
+        if self.min_load_factor and size > self.initial_size and self.count < self.min_load_factor * size:
+            self.__start_resize(max(self.__next_prime(size // 2), self.initial_size))
     
+    def __sampled(self, name, method, *args):
+        # Runs method, timing every sample_every-th call
+        calls = self.sample_calls[name] + 1
+        self.sample_calls[name] = calls
+        if calls % self.sample_every:
+            return method(*args)
+        start = time.perf_counter_ns()
+        result = method(*args)
+        self.latency_samples[name].append(time.perf_counter_ns() - start)
+        return result
+
+    def stats(self):
+        # Health of the table: how full it is, how long the buckets are,
+        # how much resizing it did, and (with sample_every) get/set latency.
+        # Probe length = how many pairs a lookup compares before it finds its key:
+        # the k-th pair in a bucket takes k, a bucket of length L costs 1 + 2 + ... + L in total
+        lengths = {}
+        probe_total = 0
+        for data_map in (self.data_map, self.old_map):
+            if data_map is None:
+                continue
+            start = self.rehash_index if data_map is self.old_map else 0 # moved buckets are already counted
+            for i in range(start, len(data_map)):
+                length = len(data_map[i]) if data_map[i] is not None else 0
+                lengths[length] = lengths.get(length, 0) + 1
+                probe_total += length * (length + 1) // 2
+        stats = {
+            "count": self.count,
+            "buckets": len(self.data_map),
+            "load_factor": self.load_factor(),
+            "bucket_lengths": dict(sorted(lengths.items())), # bucket length -> number of buckets that long
+            "max_probe": max(lengths),
+            "mean_probe": probe_total / self.count if self.count else 0.0,
+            "resizes": self.resizes,
+            "rehashed_items": self.rehashed_items,
+            "resizing": self.old_map is not None,
+        }
+        for name, samples in self.latency_samples.items():
+            if samples:
+                ordered = sorted(samples)
+                pick = lambda p: ordered[min(int(p * len(ordered)), len(ordered) - 1)] / 1000
+                stats[f"{name}_latency_us"] = {"samples": len(ordered), "p50": pick(0.5), "p99": pick(0.99), "max": ordered[-1] / 1000}
+        return stats
+
     def print_table(self):
         for i, val in enumerate(self.data_map):
             print(i, ":", val)
+        if self.old_map is not None:
+            print("Resizing, not yet moved:")
+            for i in range(self.rehash_index, len(self.old_map)):
+                print(i, ":", self.old_map[i])
+            
+    def __find(self, key):
+        # Returns (bucket, position in bucket) of key, or (None, -1) if it isn't stored.
+        # While resizing the key is either still in its old bucket or already moved
+        for data_map in (self.data_map, self.old_map):
+            if data_map is None:
+                continue
+            bucket = data_map[self.__hash(key, len(data_map))]
+            if bucket is not None:
+                for i in range(len(bucket)): # going through the list within at the index and check if we have a match with key
+                    if bucket[i][0] == key: # i is the list within list within list, where 0 stands for the key
+                        return bucket, i
+        return None, -1
+
+    def __remove_at(self, bucket, i):
+        # Swap-remove: move the last pair into the hole and drop the last slot - O(1),
+        # the order inside a bucket doesn't matter
+        pair = bucket[i]
+        bucket[i] = bucket[-1]
+        bucket.pop()
+        if not bucket: # drop empty buckets so a churned table doesn't keep lots of empty lists around
+            for data_map in (self.data_map, self.old_map):
+                if data_map is not None:
+                    index = self.__hash(pair[0], len(data_map))
+                    if data_map[index] is bucket:
+                        data_map[index] = None
+        self.count -= 1
+        self.version += 1
+        self.__maybe_shrink()
+        return pair
             
     def set_item(self, key, value):
+        # Upsert: updates the value if the key is already there, adds a new pair otherwise
+        if self.sample_every:
+            return self.__sampled("set", self.__set_item, key, value)
+        return self.__set_item(key, value)
+
+    def __set_item(self, key, value):
+        if self.old_map is not None:
+            self.__rehash_step(self.resize_step)
+        bucket, i = self.__find(key)
+        if bucket is not None:
+            bucket[i][1] = value # update in place, the bucket doesn't grow
+            return
         index = self.__hash(key) # this will compute the address
         if self.data_map[index] == None:
             self.data_map[index] = []  # initialize the empty set if it didnt exist before
         self.data_map[index].append([key, value]) # add the key - value pair to the end of the list
+        self.count += 1
+        self.version += 1
+        self.__maybe_grow()
         
     def get_item(self, key):
-        index = self.__hash(key)
-        if self.data_map[index] is not None:
-            for i in range(len(self.data_map[index])): # going through the list within at the index and check if we have a match with key
-                if self.data_map[index][i][0] == key: # i is the list within list within list, where 0 stands for the key
-                    return self.data_map[index][i][1] # return the value in the key pair list
+        if self.sample_every:
+            return self.__sampled("get", self.__get_item, key)
+        return self.__get_item(key)
+
+    def __get_item(self, key):
+        if self.old_map is not None:
+            self.__rehash_step(self.resize_step)
+        bucket, i = self.__find(key)
+        if bucket is not None:
+            return bucket[i][1] # return the value in the key pair list
         return None # if the key wasn't found
+
+    def delete_item(self, key):
+        # Returns True if the key was there and got removed, False otherwise
+        if self.old_map is not None:
+            self.__rehash_step(self.resize_step)
+        bucket, i = self.__find(key)
+        if bucket is None:
+            return False
+        self.__remove_at(bucket, i)
+        return True
+
+    def pop(self, key, default = None):
+        # Removes the key and returns its value (default if the key wasn't there)
+        if self.old_map is not None:
+            self.__rehash_step(self.resize_step)
+        bucket, i = self.__find(key)
+        if bucket is None:
+            return default
+        return self.__remove_at(bucket, i)[1]
+
+    def __contains__(self, key):
+        # `key in table` - unlike get_item this tells a missing key from a stored None
+        return self.__find(key)[0] is not None
+    # Bulk operations
+    # One set_item per key pays for a method call, a rehash step and a load check
+    # every time, and the table may resize several times on the way up.
+    # These size the table once for the whole batch and run one tight loop
+
+    @classmethod
+    def from_pairs(cls, items, **kwargs):
+        # New table filled from a dict or from (key, value) pairs, kwargs go to __init__
+        table = cls(**kwargs)
+        table.update(items)
+        return table
+
+    def __finish_resize(self):
+        if self.old_map is not None:
+            self.__rehash_step(len(self.old_map))
+
+    def reserve(self, count):
+        # Makes room for count items in one full rehash, so no resize happens while they go in
+        if self.max_load_factor is None or count <= self.max_load_factor * len(self.data_map):
+            return
+        self.__finish_resize()
+        self.__start_resize(self.__next_prime(int(count / self.max_load_factor) + 1))
+        self.__finish_resize()
+
+    def update(self, items):
+        # Upserts every (key, value) pair from a dict or any iterable of pairs
+        if hasattr(items, "items"):
+            items = items.items()
+        if not hasattr(items, "__len__"):
+            items = list(items)
+        self.reserve(self.count + len(items)) # counts updates too, worst case every key is new
+        self.__finish_resize()
+        data_map = self.data_map
+        size = len(data_map)
+        added = 0
+        # map() runs the hash function over the whole batch in C
+        for my_hash, (key, value) in zip(map(self.hash_function, (pair[0] for pair in items)), items):
+            index = my_hash % size
+            bucket = data_map[index]
+            if bucket is None:
+                data_map[index] = [[key, value]]
+                added += 1
+                continue
+            for pair in bucket:
+                if pair[0] == key:
+                    pair[1] = value
+                    break
+            else:
+                bucket.append([key, value])
+                added += 1
+        self.count += added
+        if added:
+            self.version += 1
+
+    def get_many(self, keys, default = None):
+        # Values for all keys, in the same order (default for the missing ones)
+        if not hasattr(keys, "__len__"):
+            keys = list(keys)
+        self.__finish_resize()
+        data_map = self.data_map
+        size = len(data_map)
+        result = []
+        for my_hash, key in zip(map(self.hash_function, keys), keys):
+            bucket = data_map[my_hash % size]
+            value = default
+            if bucket is not None:
+                for pair in bucket:
+                    if pair[0] == key:
+                        value = pair[1]
+                        break
+            result.append(value)
+        return result
                 
+    # Views
+    # keys(), values() and items() don't copy anything: they return a live view
+    # (like dict.keys()) that walks the buckets one entry at a time when iterated.
+    # Adding or removing a key (or a resize, e.g. from reserve()) while iterating
+    # raises RuntimeError, updating the value of an existing key is fine.
+    # update() reserves room as if every key were new, so near the grow threshold
+    # even an update of existing keys can resize and count as a change
+
+    def __len__(self):
+        return self.count # O(1), kept up to date by every add/remove
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        return HashTableView(self, "keys")
+
+    def values(self):
+        return HashTableView(self, "values")
+
+    def items(self):
+        return HashTableView(self, "items")
+
+    def _iter_pairs(self):
+        # Generator behind the views. A resize still in progress is finished first,
+        # otherwise a lookup during iteration could move an entry we already walked past
+        self.__finish_resize()
+        version = self.version
+        for bucket in self.data_map: # loops over the buckets (main list)
+            if bucket is not None:
+                for pair in bucket: # iterating within the list in a bucket
+                    if self.version != version:
+                        raise RuntimeError("HashTable changed size during iteration")
+                    yield pair[0], pair[1]
+        if self.version != version:
+            raise RuntimeError("HashTable changed size during iteration")
+
+
+class HashTableView:
+    def __init__(self, table, kind):
+        self.table = table
+        self.kind = kind # "keys", "values" or "items"
+
+    def __len__(self):
+        return len(self.table)
+
+    def __iter__(self):
+        if self.kind == "keys":
+            return (key for key, _ in self.table._iter_pairs())
+        if self.kind == "values":
+            return (value for _, value in self.table._iter_pairs())
+        return self.table._iter_pairs()
+
+    def __contains__(self, item):
+        if self.kind == "keys":
+            return item in self.table
+        if self.kind == "items":
+            key, value = item
+            return key in self.table and self.table.get_item(key) == value
+        return any(value == item for value in self)
+
+    def __repr__(self):
+        return f"{self.kind}({list(self)})"
+
+
+# Collision Method 2:
+# Open Addressing (Linear Probing, Robin Hood)
+
+# No buckets: every item lives directly in one slot of the table. If its slot
+# is taken we try the next one, and the next... (linear probing).
+# Robin Hood: while probing, an item that is further from its home slot
+# takes the slot from an item that is closer to home ("take from the rich").
+# That keeps every item close to home, and lets a lookup stop as soon as it
+# meets an item closer to home than the key would be.
+# Storage is flat parallel arrays, one entry per slot: hashes and probe
+# distances in typed arrays, keys and values in plain lists,
+# instead of a list per bucket plus a [key, value] list per item
+
+EMPTY = object() # marks a free slot (None can't, it's a valid key)
+HASH_MASK = 0xFFFFFFFFFFFFFFFF # hashes are stored as unsigned 64 bit numbers
+FIBONACCI = 0x9E3779B97F4A7C15 # 2 ** 64 / golden ratio, scrambles the hash before picking the slot
+
+class OpenAddressingHashTable:
+    def __init__(self, size = 8, max_load_factor = 0.75, hash_function = hash):
+        capacity = 8
+        while capacity < size: # a power of 2, so picking a slot is a shift instead of a %
+            capacity *= 2
+        self.max_load_factor = max_load_factor
+        self.hash_function = hash_function
+        self.count = 0
+        self.version = 0
+        self.resizes = 0
+        self.__allocate(capacity)
+
+    def __allocate(self, capacity):
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.shift = 64 - (capacity.bit_length() - 1) # keep the top bits of the scrambled hash
+        self.hashes = array("Q", [0]) * capacity
+        self.distances = array("i", [0]) * capacity # how far each item sits from its home slot
+        self.key_slots = [EMPTY] * capacity
+        self.value_slots = [None] * capacity
+
+    def __home(self, my_hash):
+        return ((my_hash * FIBONACCI) & HASH_MASK) >> self.shift
+
+    def __find(self, key, my_hash):
+        # Slot holding key, or -1
+        key_slots, hashes, distances = self.key_slots, self.hashes, self.distances
+        slot = self.__home(my_hash)
+        distance = 0
+        while True:
+            stored = key_slots[slot]
+            if stored is EMPTY or distances[slot] < distance:
+                return -1 # the key would have been placed before this point
+            if hashes[slot] == my_hash and stored == key:
+                return slot
+            slot = (slot + 1) & self.mask
+            distance += 1
+
+    def load_factor(self):
+        return self.count / self.capacity
+
+    def __grow(self, capacity = None):
+        # Full rehash into a table twice the size: O(n) but only after n/2 inserts, so O(1) amortized
+        old_hashes, old_keys, old_values = self.hashes, self.key_slots, self.value_slots
+        self.__allocate(capacity if capacity is not None else self.capacity * 2)
+        self.resizes += 1
+        self.version += 1
+        for slot in range(len(old_keys)):
+            if old_keys[slot] is not EMPTY:
+                self.__place(old_hashes[slot], old_keys[slot], old_values[slot])
+
+    def __place(self, my_hash, key, value):
+        # Robin Hood insert of a key we know is not in the table
+        key_slots, value_slots, hashes, distances = self.key_slots, self.value_slots, self.hashes, self.distances
+        slot = self.__home(my_hash)
+        distance = 0
+        while True:
+            if key_slots[slot] is EMPTY:
+                hashes[slot], key_slots[slot], value_slots[slot], distances[slot] = my_hash, key, value, distance
+                return
+            if distances[slot] < distance: # the current item is richer: swap and carry it on
+                my_hash, hashes[slot] = hashes[slot], my_hash
+                key, key_slots[slot] = key_slots[slot], key
+                value, value_slots[slot] = value_slots[slot], value
+                distance, distances[slot] = distances[slot], distance
+            slot = (slot + 1) & self.mask
+            distance += 1
+
+    def set_item(self, key, value):
+        my_hash = self.hash_function(key) & HASH_MASK
+        slot = self.__find(key, my_hash)
+        if slot != -1:
+            self.value_slots[slot] = value # upsert
+            return
+        if self.count + 1 > self.max_load_factor * self.capacity:
+            self.__grow()
+        self.__place(my_hash, key, value)
+        self.count += 1
+        self.version += 1
+
+    def get_item(self, key):
+        slot = self.__find(key, self.hash_function(key) & HASH_MASK)
+        return self.value_slots[slot] if slot != -1 else None
+
+    def __contains__(self, key):
+        return self.__find(key, self.hash_function(key) & HASH_MASK) != -1
+
+    def __remove_at(self, slot):
+        # Backward shift: pull the following items back one slot until one is already home,
+        # so no tombstones are needed and probes stay short
+        key_slots, value_slots, hashes, distances = self.key_slots, self.value_slots, self.hashes, self.distances
+        value = value_slots[slot]
+        next_slot = (slot + 1) & self.mask
+        while key_slots[next_slot] is not EMPTY and distances[next_slot] > 0:
+            hashes[slot], key_slots[slot], value_slots[slot] = hashes[next_slot], key_slots[next_slot], value_slots[next_slot]
+            distances[slot] = distances[next_slot] - 1
+            slot = next_slot
+            next_slot = (slot + 1) & self.mask
+        key_slots[slot] = EMPTY
+        value_slots[slot] = None
+        distances[slot] = 0
+        self.count -= 1
+        self.version += 1
+        return value
+
+    def delete_item(self, key):
+        slot = self.__find(key, self.hash_function(key) & HASH_MASK)
+        if slot == -1:
+            return False
+        self.__remove_at(slot)
+        return True
+
+    def pop(self, key, default = None):
+        slot = self.__find(key, self.hash_function(key) & HASH_MASK)
+        if slot == -1:
+            return default
+        return self.__remove_at(slot)
+
+    @classmethod
+    def from_pairs(cls, items, **kwargs):
+        table = cls(**kwargs)
+        table.update(items)
+        return table
+
+    def reserve(self, count):
+        # Grows once to a capacity that holds count items
+        capacity = self.capacity
+        while count > self.max_load_factor * capacity:
+            capacity *= 2
+        if capacity != self.capacity:
+            self.__grow(capacity)
+
+    def update(self, items):
+        if hasattr(items, "items"):
+            items = items.items()
+        if not hasattr(items, "__len__"):
+            items = list(items)
+        self.reserve(self.count + len(items))
+        value_slots = self.value_slots
+        for my_hash, (key, value) in zip(map(self.hash_function, (pair[0] for pair in items)), items):
+            my_hash &= HASH_MASK
+            slot = self.__find(key, my_hash)
+            if slot != -1:
+                value_slots[slot] = value
+            else:
+                self.__place(my_hash, key, value)
+                self.count += 1
+                self.version += 1
+
+    def get_many(self, keys, default = None):
+        if not hasattr(keys, "__len__"):
+            keys = list(keys)
+        key_slots, value_slots, hashes, distances = self.key_slots, self.value_slots, self.hashes, self.distances
+        mask, shift = self.mask, self.shift
+        result = []
+        for my_hash, key in zip(map(self.hash_function, keys), keys):
+            # Same probe as __find, inlined to skip a method call per key
+            my_hash &= HASH_MASK
+            slot = ((my_hash * FIBONACCI) & HASH_MASK) >> shift
+            distance = 0
+            value = default
+            while True:
+                stored = key_slots[slot]
+                if stored is EMPTY or distances[slot] < distance:
+                    break
+                if hashes[slot] == my_hash and stored == key:
+                    value = value_slots[slot]
+                    break
+                slot = (slot + 1) & mask
+                distance += 1
+            result.append(value)
+        return result
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        return HashTableView(self, "keys")
+
+    def values(self):
+        return HashTableView(self, "values")
+
+    def items(self):
+        return HashTableView(self, "items")
+
+    def _iter_pairs(self):
+        version = self.version
+        key_slots, value_slots = self.key_slots, self.value_slots # a grow swaps in new lists, the version check catches it
+        for slot in range(len(key_slots)):
+            if self.version != version:
+                raise RuntimeError("HashTable changed size during iteration")
+            if key_slots[slot] is not EMPTY:
+                yield key_slots[slot], value_slots[slot]
+        if self.version != version:
+            raise RuntimeError("HashTable changed size during iteration")
+
+    def stats(self):
+        # Same idea as HashTable.stats, here the probe length of an item is its distance from home + 1
+        distances = {}
+        probe_total = 0
+        for slot in range(self.capacity):
+            if self.key_slots[slot] is not EMPTY:
+                distance = self.distances[slot]
+                distances[distance] = distances.get(distance, 0) + 1
+                probe_total += distance + 1
+        return {
+            "count": self.count,
+            "buckets": self.capacity,
+            "load_factor": self.load_factor(),
+            "distances": dict(sorted(distances.items())), # distance from home slot -> number of items
+            "max_probe": max(distances) + 1 if distances else 0,
+            "mean_probe": probe_total / self.count if self.count else 0.0,
+            "resizes": self.resizes,
+        }
+
+    def print_table(self):
+        for slot in range(self.capacity):
+            if self.key_slots[slot] is EMPTY:
+                print(slot, ":", None)
+            else:
+                print(slot, ":", [self.key_slots[slot], self.value_slots[slot]], "distance", self.distances[slot])
+
+
+# Thread-safe Hash Table (lock striping)
+# One lock around the whole table makes every thread wait for every other one.
+# Instead the keys are split into stripes: each stripe is its own HashTable
+# with its own lock, and a key always goes to the same stripe (hash % stripes).
+# Threads working on keys in different stripes never wait for each other.
+# Read-modify-write helpers (get_or_set, increment) run under the stripe lock,
+# so two threads can't both read the old value and lose an update
+
+class ConcurrentHashTable:
+    def __init__(self, stripes = 16, hash_function = hash, **kwargs): # kwargs go to every stripe's HashTable
+        self.hash_function = hash_function
+        self.stripes = [HashTable(hash_function = hash_function, **kwargs) for _ in range(stripes)]
+        self.locks = [threading.Lock() for _ in range(stripes)]
+
+    def __stripe(self, key):
+        index = self.hash_function(key) % len(self.stripes)
+        return self.stripes[index], self.locks[index]
+
+    def set_item(self, key, value):
+        table, lock = self.__stripe(key)
+        with lock:
+            table.set_item(key, value)
+
+    def get_item(self, key):
+        table, lock = self.__stripe(key)
+        with lock: # get_item may move buckets during a resize, so it needs the lock too
+            return table.get_item(key)
+
+    def delete_item(self, key):
+        table, lock = self.__stripe(key)
+        with lock:
+            return table.delete_item(key)
+
+    def pop(self, key, default = None):
+        table, lock = self.__stripe(key)
+        with lock:
+            return table.pop(key, default)
+
+    def __contains__(self, key):
+        table, lock = self.__stripe(key)
+        with lock:
+            return key in table
+
+    def get_or_set(self, key, default):
+        # Returns the stored value, or stores default and returns it - atomically
+        table, lock = self.__stripe(key)
+        with lock:
+            if key in table:
+                return table.get_item(key)
+            table.set_item(key, default)
+            return default
+
+    def increment(self, key, amount = 1):
+        # Adds amount to the value (a missing key counts as 0) and returns the new value - atomically
+        table, lock = self.__stripe(key)
+        with lock:
+            value = (table.get_item(key) or 0) + amount
+            table.set_item(key, value)
+            return value
+
+    def __len__(self):
+        return sum(len(table) for table in self.stripes)
+
+    def items(self):
+        # A copy taken one stripe at a time: every stripe is consistent on its own,
+        # writes to other stripes can land while we go
+        result = []
+        for table, lock in zip(self.stripes, self.locks):
+            with lock:
+                result.extend(table.items())
+        return result
+
     def keys(self):
-        all_keys = []
-        for i in range(len(self.data_map)): # loops over indecies (main list)
-            if self.data_map[i] is not None:
-                for j in range(len(self.data_map[i])): # iterating within a list at index i (if there is something in there)
-                    all_keys.append(self.data_map[i][j][0]) # adding all the keys within list j that is within list i
-        return all_keys            
+        return [key for key, _ in self.items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+
+# On-disk Hash Table (memory-mapped)
+# save_hash_table writes a table to a file once, MappedHashTable opens it with mmap:
+# the OS maps the file into memory and only reads the pages a lookup touches,
+# so opening is instant no matter how big the file is, and every process that
+# opens the same file shares the same cached pages.
+#
+# File layout (all numbers little-endian):
+#   header:  b"HTBL" | version u32 | bucket count u64 | entry count u64
+#   buckets: bucket count + 1 offsets (u64), bucket i's entries run from offset i to offset i+1
+#   entries: hash u64 | key length u32 | value length u32 | key bytes | value bytes
+# Keys and values are stored encoded (see encode_item), the hash is fnv1a_hash of the
+# encoded key (see key_hash), so it's the same in every process (the built-in hash() is not)
+
+MAPPED_MAGIC = b"HTBL"
+MAPPED_VERSION = 2
+MAPPED_HEADER = struct.Struct("<4sIQQ")
+MAPPED_ENTRY = struct.Struct("<QII")
+MAPPED_OFFSET = struct.Struct("<Q")
+
+def encode_item(item):
+    # One type byte then the data: compact for the common types, pickle for anything else
+    if item is None:
+        return b"N"
+    if item is True or item is False:
+        return b"T" if item else b"F"
+    if isinstance(item, int):
+        return b"I" + item.to_bytes(item.bit_length() // 8 + 1, "little", signed = True)
+    if isinstance(item, float):
+        return b"D" + struct.pack("<d", item)
+    if isinstance(item, str):
+        return b"S" + item.encode("utf-8")
+    if isinstance(item, bytes):
+        return b"B" + item
+    return b"P" + pickle.dumps(item)
+
+def decode_item(data):
+    tag, body = data[:1], data[1:]
+    if tag == b"N":
+        return None
+    if tag == b"T" or tag == b"F":
+        return tag == b"T"
+    if tag == b"I":
+        return int.from_bytes(body, "little", signed = True)
+    if tag == b"D":
+        return struct.unpack("<d", body)[0]
+    if tag == b"S":
+        return str(body, "utf-8")
+    if tag == b"B":
+        return bytes(body)
+    return pickle.loads(body)
+
+def key_hash(key):
+    # True == 1 == 1.0 are one key in a HashTable, so they have to hash the same here:
+    # bools and whole floats are hashed as the int they equal
+    if isinstance(key, (bool, float)) and float(key).is_integer():
+        key = int(key)
+    return fnv1a_hash(encode_item(key))
+
+def save_hash_table(table, path):
+    # Works for any table with items() and len(): HashTable, OpenAddressingHashTable, a dict...
+    bucket_count = max(len(table), 1) # about one entry per bucket
+    buckets = [[] for _ in range(bucket_count)]
+    for key, value in table.items():
+        my_hash = key_hash(key)
+        buckets[my_hash % bucket_count].append((my_hash, encode_item(key), encode_item(value)))
+    with open(path, "wb") as f:
+        f.write(MAPPED_HEADER.pack(MAPPED_MAGIC, MAPPED_VERSION, bucket_count, len(table)))
+        offset = MAPPED_HEADER.size + (bucket_count + 1) * MAPPED_OFFSET.size # entries start after the index
+        offsets = array("Q", [offset])
+        for bucket in buckets:
+            for _, key_data, value_data in bucket:
+                offset += MAPPED_ENTRY.size + len(key_data) + len(value_data)
+            offsets.append(offset)
+        f.write(offsets.tobytes() if sys.byteorder == "little" else struct.pack(f"<{len(offsets)}Q", *offsets))
+        for bucket in buckets:
+            for my_hash, key_data, value_data in bucket:
+                f.write(MAPPED_ENTRY.pack(my_hash, len(key_data), len(value_data)))
+                f.write(key_data)
+                f.write(value_data)
+
+
+class MappedHashTable:
+    # Read-only table over a file written by save_hash_table.
+    # Nothing is read up front: a lookup reads one bucket offset pair and that bucket's entries,
+    # and only the value that matches gets decoded
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = None
+        self.view = None
+        if os.fstat(self.file.fileno()).st_size < MAPPED_HEADER.size: # also covers an empty file, which mmap refuses
+            self.close()
+            raise ValueError(f"{path} is not a saved HashTable file")
+        self.map = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        magic, version, self.bucket_count, self.count = MAPPED_HEADER.unpack_from(self.map, 0)
+        if magic != MAPPED_MAGIC or version != MAPPED_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a saved HashTable file")
+
+    def close(self):
+        if self.map is not None:
+            self.view.release()
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __bucket(self, index):
+        position = MAPPED_HEADER.size + index * MAPPED_OFFSET.size
+        return MAPPED_OFFSET.unpack_from(self.map, position)[0], MAPPED_OFFSET.unpack_from(self.map, position + MAPPED_OFFSET.size)[0]
+
+    def __find(self, key):
+        # Returns (start, end) of the value bytes, or None
+        key_data = encode_item(key)
+        my_hash = key_hash(key)
+        position, end = self.__bucket(my_hash % self.bucket_count)
+        while position < end:
+            entry_hash, key_length, value_length = MAPPED_ENTRY.unpack_from(self.map, position)
+            position += MAPPED_ENTRY.size
+            # memoryview slices compare against bytes without copying,
+            # only an equal key stored as another type (1 vs 1.0) needs decoding
+            if entry_hash == my_hash:
+                stored = self.view[position:position + key_length]
+                if stored == key_data or decode_item(stored) == key:
+                    return position + key_length, position + key_length + value_length
+            position += key_length + value_length
+        return None
+
+    def get_item(self, key):
+        found = self.__find(key)
+        return decode_item(self.view[found[0]:found[1]]) if found is not None else None
+
+    def __contains__(self, key):
+        return self.__find(key) is not None
+
+    def items(self):
+        # Generator walking the entries in file order
+        position = MAPPED_HEADER.size + (self.bucket_count + 1) * MAPPED_OFFSET.size
+        end = len(self.map)
+        while position < end:
+            _, key_length, value_length = MAPPED_ENTRY.unpack_from(self.map, position)
+            position += MAPPED_ENTRY.size
+            yield (decode_item(self.view[position:position + key_length]),
+                   decode_item(self.view[position + key_length:position + key_length + value_length]))
+            position += key_length + value_length
+
+    def keys(self):
+        return (key for key, _ in self.items())
+
+    def values(self):
+        return (value for _, value in self.items())
+
+    def __iter__(self):
+        return self.keys()
+
+
+def benchmark_latency(sizes = (10, 100, 1000, 10000, 100000), fixed_limit = 10000):
+    # Per-call set/get latency percentiles, growing table vs the old fixed 7 buckets.
+    # The fixed table gets O(n) slower per call, so it is skipped above fixed_limit keys
+    # (try sizes=(10, 100, 1000, 10000, 100000, 1000000) for the full run)
+    def percentiles(samples):
+        samples.sort()
+        pick = lambda p: samples[min(int(p * len(samples)), len(samples) - 1)] / 1000
+        return f"p50={pick(0.5):7.2f}us p99={pick(0.99):7.2f}us max={samples[-1] / 1000:8.1f}us"
+
+    for n in sizes:
+        keys = [f"key{i}" for i in range(n)]
+        for label, table in (("growing", HashTable()), ("fixed 7", HashTable(max_load_factor = None))):
+            if label == "fixed 7" and n > fixed_limit:
+                continue
+            set_times = []
+            for key in keys:
+                start = time.perf_counter_ns()
+                table.set_item(key, 1)
+                set_times.append(time.perf_counter_ns() - start)
+            get_times = []
+            for key in keys:
+                start = time.perf_counter_ns()
+                table.get_item(key)
+                get_times.append(time.perf_counter_ns() - start)
+            print(f"{n:>8} keys {label:>8}: set {percentiles(set_times)}")
+            print(f"{'':>23} get {percentiles(get_times)}")
+
+
+def hash_report(keys = None, size = 1009, repeat = 5):
+    # How evenly each hash function spreads keys over size buckets, and how fast it is.
+    # A perfect spread puts len(keys) / size keys in every bucket
+    keys = keys if keys is not None else [f"key{i}" for i in range(10000)]
+    print(f"{len(keys)} keys over {size} buckets (ideal {len(keys) / size:.1f} per bucket):")
+    for hash_function in (sum_hash, fnv1a_hash, hash):
+        counts = [0] * size
+        for key in keys:
+            counts[hash_function(key) % size] += 1
+        used = sum(1 for c in counts if c)
+        anagrams = hash_function("nuts") % size == hash_function("stun") % size
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for key in keys:
+                hash_function(key)
+        rate = len(keys) * repeat / (time.perf_counter() - start)
+        print(f"  {hash_function.__name__:>10}: used {used:>4}/{size} buckets  longest={max(counts):>5}  "
+              f"nuts/stun collide={anagrams!s:>5}  {rate / 1e6:.2f}M hashes/s")
+
+
+def benchmark_engines(n = 100000, probes = 100000):
+    # Memory per entry (tracemalloc) and lookup throughput: chaining vs open addressing
+    # (try n=10**6; the keys and values themselves are created before measuring, so
+    # only the table's own structure is counted)
+    import random
+    import tracemalloc
+
+    keys = [f"key{i}" for i in range(n)]
+    lookups = [random.choice(keys) for _ in range(probes)]
+    misses = [f"miss{i}" for i in range(probes)]
+    print(f"{n} entries, {probes} hits and {probes} misses:")
+    for table_class in (HashTable, OpenAddressingHashTable):
+        tracemalloc.start()
+        table = table_class()
+        for i, key in enumerate(keys):
+            table.set_item(key, i)
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for key in lookups:
+            table.get_item(key)
+        hit_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for key in misses:
+            table.get_item(key)
+        miss_time = time.perf_counter() - start
+        print(f"  {table_class.__name__:>23}: {used / n:6.1f} bytes/entry  "
+              f"hits {probes / hit_time / 1e6:.2f}M/s  misses {probes / miss_time / 1e6:.2f}M/s")
+
+
+def benchmark_bulk(n = 200000):
+    # One call per key vs one call for the whole batch, starting from an empty table
+    import gc
+
+    pairs = [(f"key{i}", i) for i in range(n)]
+    keys = [pair[0] for pair in pairs]
+    print(f"Loading and reading back {n} pairs:")
+    for table_class in (HashTable, OpenAddressingHashTable):
+        table = None
+        gc.collect() # so the garbage collector doesn't bill one run for the previous table
+        start = time.perf_counter()
+        table = table_class()
+        for key, value in pairs:
+            table.set_item(key, value)
+        set_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for key in keys:
+            table.get_item(key)
+        get_time = time.perf_counter() - start
+
+        table = None
+        gc.collect()
+        start = time.perf_counter()
+        table = table_class.from_pairs(pairs)
+        update_time = time.perf_counter() - start
+        start = time.perf_counter()
+        table.get_many(keys)
+        get_many_time = time.perf_counter() - start
+        print(f"  {table_class.__name__:>23}: set_item loop {set_time:.3f}s  from_pairs {update_time:.3f}s ({set_time / update_time:.1f}x)  "
+              f"get_item loop {get_time:.3f}s  get_many {get_many_time:.3f}s ({get_time / get_many_time:.1f}x)")
+
+
+def benchmark_concurrent(operations = 100000, key_space = 10000, thread_counts = (1, 4, 16)):
+    # increment() on random keys, the same total work split across N threads:
+    # 16 stripes vs 1 stripe (a single global lock).
+    # CPython's GIL runs one thread at a time, so striping can't add parallelism here,
+    # what it saves is threads queueing on one lock and the hand-offs that causes
+    import random
+
+    print(f"{operations} increments over {key_space} keys:")
+    for stripes in (1, 16):
+        for thread_count in thread_counts:
+            table = ConcurrentHashTable(stripes = stripes)
+            per_thread = operations // thread_count
+            key_lists = [[f"key{random.randrange(key_space)}" for _ in range(per_thread)] for _ in range(thread_count)]
+
+            def worker(keys):
+                for key in keys:
+                    table.increment(key)
+
+            threads = [threading.Thread(target = worker, args = (keys,)) for keys in key_lists]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            print(f"  {stripes:>2} stripe(s), {thread_count:>2} threads: {per_thread * thread_count / elapsed / 1000:7.1f}k ops/s")
+
+
+def benchmark_cold_start(n = 200000, probes = 1000):
+    # Startup cost: rebuilding a table from the source pairs vs opening the saved file,
+    # each followed by a handful of lookups
+    import random
+    import tempfile
+
+    pairs = [(f"key{i}", i) for i in range(n)]
+    lookups = [f"key{random.randrange(n)}" for _ in range(probes)]
+    path = os.path.join(tempfile.mkdtemp(), "table.htbl")
+
+    start = time.perf_counter()
+    table = HashTable.from_pairs(pairs)
+    for key in lookups:
+        table.get_item(key)
+    rebuild_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    save_hash_table(table, path)
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with MappedHashTable(path) as mapped:
+        for key in lookups:
+            mapped.get_item(key)
+    mapped_time = time.perf_counter() - start
+
+    print(f"{n} pairs, {probes} lookups after start ({os.path.getsize(path) / n:.1f} bytes/entry on disk):")
+    print(f"  rebuild from pairs: {rebuild_time:.3f}s")
+    print(f"  open mapped file:   {mapped_time:.3f}s  ({rebuild_time / mapped_time:.0f}x faster, one-off save took {save_time:.3f}s)")
+    os.remove(path)
+
+
+def check(expect, actual, message):
+    print(message)
+    print("EXPECTED:", expect)
+    print("RETURNED:", actual)
+    print("PASS" if expect == actual else "FAIL", "\n")
         
         
 # Example usage
@@ -112,4 +1166,362 @@ if __name__ == "__main__":
     print('Looking for caps:',my_hash_table.get_item('caps'))
     
     print("\nTesting Keys Method:")
-    print(my_hash_table.keys())
\ No newline at end of file
+    print(my_hash_table.keys())
+
+    print("\nTesting Stats Method:")
+    print(my_hash_table.stats())
+
+    print("\n----- Test: Table Grows Past the Max Load Factor -----\n")
+    table = HashTable()
+    for i in range(5):
+        table.set_item(f"key{i}", i)
+    check(7, len(table.data_map), "Buckets after 5 items (load 0.71):")
+    table.set_item("key5", 5)
+    check(17, len(table.data_map), "Buckets after 6 items (load 0.86 > 0.75, next prime after 2 * 7 + 1):")
+    check(17, len(HashTable(size = 17).data_map), "Custom initial size:")
+    table = HashTable()
+    for i in range(1000):
+        table.set_item(f"key{i}", i)
+    check(True, table.load_factor() <= 0.75, "Load factor stays under 0.75 after 1000 items:")
+    check(list(range(1000)), [table.get_item(f"key{i}") for i in range(1000)], "Every item is found after growing:")
+    check(1000, len(table.keys()), "Keys after growing:")
+
+    print("\n----- Test: Lookups During an Incremental Resize -----\n")
+    table = HashTable(size = 101, rehash_step = 1)
+    for i in range(76):
+        table.set_item(f"key{i}", i)
+    check(True, table.old_map is not None, "A resize is in progress:")
+    check(75, table.get_item("key75"), "Item added right before the resize:")
+    check(0, table.get_item("key0"), "Item still in the old table:")
+    check(76, len(table.keys()), "Keys sees both tables:")
+    for i in range(200):
+        table.get_item("key0")
+    check(None, table.old_map, "Resize finished after enough operations:")
+
+    print("\n----- Test: No Operation Finishes a Whole Resize -----\n")
+    table = HashTable(min_load_factor = 0.3)
+    for i in range(20000):
+        table.set_item(i, i)
+    worst = 0
+    def timed_rehash(operation, *args):
+        global worst
+        before = table.rehashed_items
+        operation(*args)
+        worst = max(worst, table.rehashed_items - before)
+    i = 0
+    while table.old_map is None or len(table.old_map) < len(table.data_map): # delete until a shrink starts
+        timed_rehash(table.delete_item, i)
+        i += 1
+    resizes = table.resizes
+    while table.resizes == resizes: # then insert until a grow starts
+        timed_rehash(table.set_item, -i, i)
+        i += 1
+    check(True, len(table.data_map) > len(table.old_map), "A grow followed the shrink:")
+    check(True, worst < 200, "Rehashed items per operation stay small across a shrink then grow:")
+
+    print("\n----- Test: Fixed Size Table -----\n")
+    table = HashTable(max_load_factor = None)
+    for i in range(100):
+        table.set_item(f"key{i}", i)
+    check(7, len(table.data_map), "Buckets with growing turned off:")
+
+    print("\n----- Test: Set Item Updates Existing Keys -----\n")
+    table = HashTable()
+    table.set_item("bolts", 1400)
+    for i in range(1000):
+        table.set_item("counter", i)
+    check(999, table.get_item("counter"), "Value after 1000 updates:")
+    check(2, table.count, "Item count after 1000 updates of one key:")
+    check(1, sum(1 for bucket in table.data_map if bucket for pair in bucket if pair[0] == "counter"), "Pairs stored for the updated key:")
+
+    print("\n----- Test: Delete, Pop and Contains -----\n")
+    table = HashTable()
+    table.set_item("bolts", 1400)
+    table.set_item("nuts", 300)
+    table.set_item("empty", None)
+    check(True, "empty" in table, "A key storing None is in the table:")
+    check(False, "caps" in table, "Missing key is not in the table:")
+    check(True, table.delete_item("bolts"), "Delete bolts:")
+    check(False, table.delete_item("bolts"), "Delete bolts again:")
+    check(None, table.get_item("bolts"), "Get deleted key:")
+    check(300, table.pop("nuts"), "Pop nuts:")
+    check("gone", table.pop("nuts", "gone"), "Pop missing key with a default:")
+    check(1, table.count, "Item count after delete and pop:")
+    check(["empty"], list(table.keys()), "Keys after delete and pop:")
+
+    print("\n----- Test: Churn Keeps the Table Small -----\n")
+    table = HashTable(min_load_factor = 0.1)
+    for i in range(10000):
+        table.set_item(f"key{i}", i)
+    for i in range(10000):
+        if i % 100:
+            table.delete_item(f"key{i}")
+    for i in range(200): # let the shrinking resize finish
+        table.get_item("key0")
+    check(100, table.count, "Item count after deleting 99%:")
+    check(True, len(table.data_map) < 1000, "Table shrank:")
+    check(list(range(0, 10000, 100)), [table.get_item(f"key{i}") for i in range(0, 10000, 100)], "Remaining keys still found:")
+    check(0, sum(1 for bucket in table.data_map if bucket == []), "No empty bucket lists left behind:")
+
+    print("\n----- Test: Grow and Shrink Don't Fight -----\n")
+    table = HashTable(min_load_factor = 0.3)
+    for i in range(20000):
+        table.set_item(f"key{i}", i)
+    check(True, table.resizes < 16, "Inserts with min_load_factor set only grow (about log2(n / 7) resizes):")
+    check(True, table.rehashed_items < 3 * 20000, "Rehashed items stay O(n):")
+    try:
+        HashTable(min_load_factor = 0.4)
+        check(ValueError, None, "min_load_factor too close to max_load_factor:")
+    except ValueError:
+        check(ValueError, ValueError, "min_load_factor too close to max_load_factor:")
+
+    print("\n----- Test: Open Addressing Engine -----\n")
+    table = OpenAddressingHashTable()
+    for key, value in [("bolts", 1400), ("washers", 50), ("nuts", 300), ("stun", 1), (None, "none key")]:
+        table.set_item(key, value)
+    table.set_item("bolts", 1500)
+    check(1500, table.get_item("bolts"), "Updated value:")
+    check(5, table.count, "Item count after an update:")
+    check("none key", table.get_item(None), "None works as a key:")
+    check(True, "stun" in table, "Contains stun:")
+    check(None, table.get_item("caps"), "Missing key:")
+    check(True, table.delete_item("nuts"), "Delete nuts:")
+    check(False, table.delete_item("nuts"), "Delete nuts again:")
+    check(50, table.pop("washers"), "Pop washers:")
+    check([None, "bolts", "stun"], sorted(table.keys(), key = str), "Keys after delete and pop:")
+
+    print("\n----- Test: Open Addressing Matches Chaining Under Churn -----\n")
+    import random
+    for hash_function in (hash, sum_hash, lambda key: 0): # sum_hash and a constant hash force long probe runs
+        chained = HashTable(hash_function = hash_function)
+        table = OpenAddressingHashTable(hash_function = hash_function)
+        for _ in range(3000):
+            key = f"k{random.randrange(300)}"
+            if random.random() < 0.6:
+                chained.set_item(key, key)
+                table.set_item(key, key)
+            else:
+                chained.delete_item(key)
+                table.delete_item(key)
+        check(sorted(chained.keys()), sorted(table.keys()), f"Same keys ({hash_function.__name__}):")
+        check(True, all(table.get_item(key) == key for key in chained.keys()), f"Same values ({hash_function.__name__}):")
+        check(True, table.load_factor() <= 0.75, f"Load factor under 0.75 ({hash_function.__name__}):")
+
+    print("\n----- Test: Bulk Update, Get Many and From Pairs -----\n")
+    for table_class in (HashTable, OpenAddressingHashTable):
+        name = table_class.__name__
+        table = table_class.from_pairs({"bolts": 1400, "nuts": 300})
+        table.update([("nuts", 350), ("washers", 50)])
+        table.update((f"key{i}", i) for i in range(1000)) # a generator works too
+        check([1400, 350, 50, 999, None], table.get_many(["bolts", "nuts", "washers", "key999", "caps"]), f"{name} get_many:")
+        check(1003, table.count, f"{name} item count after updates:")
+        check("none", table.get_many(["caps"], "none")[0], f"{name} get_many default:")
+        check(True, table.load_factor() <= 0.75, f"{name} load factor after update:")
+    table = HashTable()
+    for i in range(5): # leaves a resize half done
+        table.set_item(f"old{i}", i)
+    table.set_item("old5", 5)
+    table.update({f"new{i}": i for i in range(50)})
+    check([0, 5, 49], table.get_many(["old0", "old5", "new49"]), "Update during a resize keeps the old keys:")
+    check(None, table.old_map, "No resize left in progress after update:")
+
+    print("\n----- Test: Lazy Views -----\n")
+    for table_class in (HashTable, OpenAddressingHashTable):
+        name = table_class.__name__
+        table = table_class.from_pairs({"bolts": 1400, "nuts": 300, "washers": 50})
+        keys = table.keys()
+        check(3, len(keys), f"{name} len of keys view:")
+        check(3, len(table), f"{name} len of table:")
+        check(["bolts", "nuts", "washers"], sorted(keys), f"{name} keys:")
+        check([50, 300, 1400], sorted(table.values()), f"{name} values:")
+        check([("bolts", 1400), ("nuts", 300), ("washers", 50)], sorted(table.items()), f"{name} items:")
+        check(["bolts", "nuts", "washers"], sorted(table), f"{name} iterating the table gives keys:")
+        check(True, "nuts" in keys and ("nuts", 300) in table.items() and 50 in table.values(), f"{name} view membership:")
+        table.set_item("caps", 5)
+        check(4, len(keys), f"{name} view is live, sees the new key:")
+        for key, value in table.items():
+            table.set_item(key, value + 1) # updating values while iterating is allowed
+        check(1401, table.get_item("bolts"), f"{name} values updated while iterating:")
+        try:
+            for key in table.keys():
+                table.set_item(key + "!", 0)
+            result = "no error"
+        except RuntimeError:
+            result = "RuntimeError"
+        check("RuntimeError", result, f"{name} adding a key while iterating:")
+        try:
+            for key in table.keys():
+                table.delete_item(key)
+            result = "no error"
+        except RuntimeError:
+            result = "RuntimeError"
+        check("RuntimeError", result, f"{name} removing a key while iterating:")
+
+    print("\n----- Test: Concurrent Hash Table -----\n")
+    table = ConcurrentHashTable(stripes = 4)
+    table.set_item("bolts", 1400)
+    check(1400, table.get_item("bolts"), "Get bolts:")
+    check(1400, table.get_or_set("bolts", 0), "Get_or_set on an existing key:")
+    check(7, table.get_or_set("nuts", 7), "Get_or_set on a new key:")
+    check(8, table.increment("nuts"), "Increment nuts:")
+    check(5, table.increment("caps", 5), "Increment a missing key:")
+    check(True, "caps" in table, "Contains caps:")
+    check(5, table.pop("caps"), "Pop caps:")
+    check(2, len(table), "Len:")
+    check([("bolts", 1400), ("nuts", 8)], sorted(table.items()), "Items:")
+
+    print("\n----- Test: Concurrent Increments Don't Lose Updates -----\n")
+    table = ConcurrentHashTable()
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(2000):
+            table.increment(f"key{rng.randrange(50)}")
+            table.get_or_set(f"seen{rng.randrange(500)}", seed)
+
+    threads = [threading.Thread(target = worker, args = (seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    check(16000, sum(table.get_item(f"key{i}") or 0 for i in range(50)), "Total of all counters:")
+    check(len(set(table.keys())), len(table.keys()), "No key stored twice:")
+
+    print("\n----- Test: Save and Open a Mapped Table -----\n")
+    import tempfile
+    path = os.path.join(tempfile.mkdtemp(), "tools.htbl")
+    table = HashTable.from_pairs({"bolts": 1400, "price": 99.99, "instock": True, "brand": "DeWalt",
+                                  42: [1, 2, 3], (1, 2): None, b"raw": -5, "big": 2 ** 70})
+    save_hash_table(table, path)
+    with MappedHashTable(path) as mapped:
+        check(len(table), len(mapped), "Same number of entries:")
+        check(True, all(mapped.get_item(key) == value for key, value in table.items()), "Every value reads back:")
+        check(sorted(map(repr, table.items())), sorted(map(repr, mapped.items())), "Items round trip:")
+        check(None, mapped.get_item("caps"), "Missing key:")
+        check(True, (1, 2) in mapped, "Contains a key storing None:")
+        check(False, "caps" in mapped, "Doesn't contain a missing key:")
+    save_hash_table(HashTable(), path)
+    with MappedHashTable(path) as mapped:
+        check(0, len(mapped), "Empty table round trip:")
+        check(None, mapped.get_item("bolts"), "Lookup in an empty file:")
+    with open(path, "wb") as f:
+        f.write(b"not a table" * 4)
+    try:
+        MappedHashTable(path)
+        result = "opened"
+    except ValueError:
+        result = "ValueError"
+    check("ValueError", result, "Opening a file that isn't a saved table:")
+    for data in [b"", b"HTBL"]:
+        with open(path, "wb") as f:
+            f.write(data)
+        try:
+            MappedHashTable(path)
+            result = "opened"
+        except ValueError:
+            result = "ValueError"
+        check("ValueError", result, f"Opening a file shorter than the header ({len(data)} bytes):")
+    table = HashTable.from_pairs({1: "int", 2.0: "float", True: "bool replaces int"})
+    save_hash_table(table, path)
+    with MappedHashTable(path) as mapped:
+        check([table.get_item(key) for key in [1, True, 1.0, 2, 2.0, 2.5]], [mapped.get_item(key) for key in [1, True, 1.0, 2, 2.0, 2.5]], "Equal numeric keys find the same entry:")
+    os.remove(path)
+
+    print("\n----- Test: Stats -----\n")
+    table = HashTable(size = 5, max_load_factor = None, hash_function = lambda key: key)
+    for key in [0, 5, 10, 1, 2]: # 0, 5 and 10 all land in bucket 0
+        table.set_item(key, key)
+    stats = table.stats()
+    check({0: 2, 1: 2, 3: 1}, stats["bucket_lengths"], "Bucket length histogram:")
+    check(3, stats["max_probe"], "Max probe length:")
+    check((1 + 2 + 3 + 1 + 1) / 5, stats["mean_probe"], "Mean probe length:")
+    check(1.0, stats["load_factor"], "Load factor:")
+    table = HashTable()
+    for i in range(100):
+        table.set_item(f"key{i}", i)
+    for i in range(200):
+        table.get_item("key0")
+    stats = table.stats()
+    check(True, stats["resizes"] > 0, "Resizes counted:")
+    check(False, stats["resizing"], "No resize in progress after enough operations:")
+    check(True, stats["rehashed_items"] >= 75, "Rehashed items counted:")
+    check(False, "get_latency_us" in stats, "No latency without sampling:")
+    table = HashTable(sample_every = 10)
+    for i in range(100):
+        table.set_item(f"key{i}", i)
+        table.get_item(f"key{i}")
+    stats = table.stats()
+    check(10, stats["get_latency_us"]["samples"], "Every 10th get is sampled:")
+    check(10, stats["set_latency_us"]["samples"], "Every 10th set is sampled:")
+    check(99, table.get_item("key99"), "Sampled table still works:")
+    import copy
+    copied = copy.deepcopy(table)
+    copied.set_item("copy only", 1)
+    check((False, True), ("copy only" in table, "copy only" in copied), "Deep copy of a sampled table is independent:")
+    check(99, pickle.loads(pickle.dumps(table)).get_item("key99"), "Sampled table pickles:")
+    table = OpenAddressingHashTable.from_pairs((i, i) for i in range(100))
+    stats = table.stats()
+    check(100, sum(stats["distances"].values()), "Open addressing distance histogram covers every item:")
+    check(True, 1 <= stats["mean_probe"] <= stats["max_probe"], "Open addressing probe lengths:")
+
+    print("\n----- Test: Same Iteration Rules for Both Engines -----\n")
+    for table_class in (HashTable, OpenAddressingHashTable):
+        table = table_class.from_pairs((i, i) for i in range(3))
+        table.reserve(100)
+        for key, value in table.items():
+            table.update({key: value + 1})
+        check([1, 2, 3], sorted(table.values()), f"{table_class.__name__}: update of existing keys while iterating:")
+        try:
+            for key in table.keys():
+                table.reserve(1000)
+            check(RuntimeError, None, f"{table_class.__name__}: resize while iterating:")
+        except RuntimeError:
+            check(RuntimeError, RuntimeError, f"{table_class.__name__}: resize while iterating:")
+
+    print("\n----- Test: Hash Functions -----\n")
+    check(sum_hash("nuts"), sum_hash("stun"), "Sum hash: anagrams collide:")
+    check(False, fnv1a_hash("nuts") == fnv1a_hash("stun"), "FNV-1a: anagrams don't collide:")
+    check(0xaf63dc4c8601ec8c, fnv1a_hash("a"), "FNV-1a of 'a' (published test vector):")
+    check(fnv1a_hash(b"abc"), fnv1a_hash("abc"), "FNV-1a: str and its utf-8 bytes match:")
+    check(True, fnv1a_hash(1) == fnv1a_hash(1.0) == fnv1a_hash(True), "FNV-1a: 1, 1.0 and True hash the same:")
+    check(fnv1a_hash((1, "a")), fnv1a_hash((1.0, "a")), "FNV-1a: equal tuples hash the same:")
+    for table_class in (HashTable, OpenAddressingHashTable):
+        table = table_class(hash_function = fnv1a_hash)
+        table.set_item(1, "one")
+        check(["one", "one", "one"], [table.get_item(key) for key in (1, 1.0, True)], f"{table_class.__name__} with FNV-1a finds 1, 1.0 and True:")
+    try:
+        fnv1a_hash(object())
+        result = "hashed"
+    except TypeError:
+        result = "TypeError"
+    check("TypeError", result, "FNV-1a rejects keys without a stable encoding:")
+
+    print("\n----- Test: Pluggable Hash and Non-String Keys -----\n")
+    for hash_function in (hash, fnv1a_hash, sum_hash):
+        table = HashTable(hash_function = hash_function)
+        table.set_item("nuts", 1)
+        table.set_item("stun", 2)
+        check([1, 2], [table.get_item("nuts"), table.get_item("stun")], f"{hash_function.__name__}: anagram keys keep their values:")
+    table = HashTable()
+    table.set_item(42, "int")
+    table.set_item((1, 2), "tuple")
+    table.set_item(3.5, "float")
+    check(["int", "tuple", "float"], [table.get_item(42), table.get_item((1, 2)), table.get_item(3.5)], "Non-string keys:")
+
+    print("\n----- Benchmark: Hash Distribution and Speed -----\n")
+    hash_report()
+
+    print("\n----- Benchmark: Chaining vs Open Addressing -----\n")
+    benchmark_engines()
+
+    print("\n----- Benchmark: Bulk vs Per-Key Calls -----\n")
+    benchmark_bulk()
+
+    print("\n----- Benchmark: Striped vs Global Lock -----\n")
+    benchmark_concurrent()
+
+    print("\n----- Benchmark: Cold Start -----\n")
+    benchmark_cold_start()
+
+    print("\n----- Benchmark: Get/Set Latency -----\n")
+    benchmark_latency()
@@ -7,9 +7,20 @@ class Node:
         next_val = self.next.value if self.next else None
         print(f"Node({self.value}) | Next: {next_val}")
 
-class LinkedList:
+class BackLinkedNode(Node):
+    # Node that also points back at its predecessor, used when LinkedList(back_links = True)
     def __init__(self, value):
-        new_node = Node(value)
+        super().__init__(value)
+        self.prev = None
+
+class LinkedList:
+    def __init__(self, value, back_links = False):
+        # back_links = True keeps a prev pointer on every node, so pop() doesn't have to
+        # walk from head to find the node before the tail: O(1) instead of O(n),
+        # at the cost of one extra pointer per node
+        self.back_links = back_links
+        self.node_class = BackLinkedNode if back_links else Node
+        new_node = self.node_class(value)
         self.head = new_node
         self.tail = new_node
         self.length = 1
@@ -24,17 +35,21 @@ class LinkedList:
         print(" -> ".join(values))
         
     def append(self, value):
-        new_node = Node(value)
+        new_node = self.node_class(value)
         if self.length == 0:
             self.head = new_node
             self.tail = new_node
         else:
             self.tail.next = new_node
+            if self.back_links:
+                new_node.prev = self.tail
             self.tail = new_node
         self.length += 1
         return True
     
     def pop(self):
+        if self.back_links:
+            return self.__pop_back_linked()
         pre = self.head
         temp = self.head
         if self.length == 0:
@@ -49,14 +64,31 @@ class LinkedList:
             self.head = None
             self.tail = None
         return temp
+
+    def __pop_back_linked(self):
+        # O(1): the node before the tail is tail.prev
+        if self.length == 0:
+            return None
+        temp = self.tail
+        if self.length == 1:
+            self.head = None
+            self.tail = None
+        else:
+            self.tail = temp.prev
+            self.tail.next = None
+            temp.prev = None
+        self.length -= 1
+        return temp
     
     def prepend(self, value):
-        new_node = Node(value)
+        new_node = self.node_class(value)
         if self.length == 0:
             self.head = new_node
             self.tail = new_node
         else:
             new_node.next = self.head
+            if self.back_links:
+                self.head.prev = new_node
             self.head = new_node
         self.length += 1
         return True
@@ -70,11 +102,19 @@ class LinkedList:
         self.length -= 1
         if self.length == 0:
             self.tail = None
+        elif self.back_links:
+            self.head.prev = None
         return temp
 
     def get(self, index):
         if index < 0 or index >= self.length:
             return None
+        if self.back_links and index > self.length // 2:
+            # closer to the tail, walk backwards
+            temp = self.tail
+            for _ in range(self.length - 1 - index):
+                temp = temp.prev
+            return temp
         temp = self.head
         for _ in range(index): # we use _ because we are not using a variable in the foor loop
             temp = temp.next
@@ -96,10 +136,13 @@ class LinkedList:
         if index == self.length:
             return self.append(value)
         
-        new_node = Node(value)
+        new_node = self.node_class(value)
         temp = self.get(index-1)
         new_node.next = temp.next
         temp.next = new_node
+        if self.back_links:
+            new_node.prev = temp
+            new_node.next.prev = new_node
         self.length += 1
         return True
         
@@ -115,22 +158,341 @@ class LinkedList:
         temp = prev.next
         prev.next = temp.next
         temp.next = None
+        if self.back_links:
+            prev.next.prev = prev
+            temp.prev = None
         self.length -= 1
         return temp
     
-    def reverse(self):
-        temp = self.head
-        self.head = self.tail
-        self.tail = temp
-        after = temp.next
-        before = None
-        for _ in range(sewalf.length):
+    def __reverse_run(self, before, first, count):
+        # Reverses count nodes starting at first by flipping their next pointers in place,
+        # before is the node in front of first (None if first is the head).
+        # Returns first, which is now the last node of the run
+        temp = first
+        previous = None
+        for _ in range(count):
             after = temp.next
-            temp.next = before # reversing the pointer
-            before = temp # bringing up the pointer to the newxt Node
+            temp.next = previous # reversing the pointer
+            if self.back_links:
+                temp.prev = after
+            previous = temp # bringing up the pointer to the next Node
             temp = after
-        
-        
+        # previous is the new start of the run, temp the node after it
+        first.next = temp
+        if before is None:
+            self.head = previous
+        else:
+            before.next = previous
+        if temp is None:
+            self.tail = first
+        if self.back_links:
+            previous.prev = before
+            if temp is not None:
+                temp.prev = first
+        return first
+
+    def reverse(self):
+        # O(n) time, O(1) extra memory: nodes are relinked, never copied
+        if self.length == 0:
+            return
+        self.__reverse_run(None, self.head, self.length)
+
+    def reverse_between(self, i, j):
+        # Reverses the nodes from index i to index j, both included
+        if i < 0 or j >= self.length or i > j:
+            return False
+        before = self.get(i - 1) if i > 0 else None
+        first = before.next if before is not None else self.head
+        self.__reverse_run(before, first, j - i + 1)
+        return True
+
+    def reverse_k_group(self, k):
+        # Reverses every group of k nodes, a last group shorter than k stays as it is
+        if k < 1:
+            return False
+        before = None
+        first = self.head
+        for _ in range(self.length // k):
+            before = self.__reverse_run(before, first, k)
+            first = before.next
+        return True
+
+    def rotate(self, k):
+        # Same direction as collections.deque.rotate: k > 0 moves the last k nodes to the front,
+        # k < 0 moves the first -k nodes to the back
+        if self.length < 2:
+            return True
+        k %= self.length
+        if k == 0:
+            return True
+        new_tail = self.get(self.length - k - 1)
+        new_head = new_tail.next
+        self.tail.next = self.head # close the ring, then cut it after new_tail
+        new_tail.next = None
+        if self.back_links:
+            self.head.prev = self.tail
+            new_head.prev = None
+        self.head = new_head
+        self.tail = new_tail
+        return True
+
+    # Sequence protocol: iteration, len(), reversed(), indexing and slicing work on values,
+    # get() and the methods above still hand out Nodes
+
+    def _empty_like(self):
+        # New empty list of the same kind
+        new_list = self.__class__(None, back_links = self.back_links)
+        new_list.pop_first()
+        return new_list
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        temp = self.head
+        while temp is not None:
+            yield temp.value
+            temp = temp.next
+
+    def __reversed__(self):
+        if self.back_links:
+            temp = self.tail
+            while temp is not None:
+                yield temp.value
+                temp = temp.prev
+        else:
+            # no way back without prev pointers, so the values are collected first: O(n) extra memory
+            yield from reversed(list(self))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            result = self._empty_like()
+            result.extend(self.__slice(index))
+            return result
+        if index < 0:
+            index += self.length
+        node = self.get(index)
+        if node is None:
+            raise IndexError("linked list index out of range")
+        return node.value
+
+    def __slice(self, index):
+        # Walks only from the head (or tail) to the end of the span
+        start, stop, step = index.indices(self.length)
+        if step > 0:
+            if start >= stop:
+                return
+            temp = self.get(start)
+            for i in range(start, stop):
+                if (i - start) % step == 0:
+                    yield temp.value
+                temp = temp.next
+        else:
+            if start <= stop:
+                return
+            if self.back_links:
+                temp = self.get(start)
+                for i in range(start, stop, -1):
+                    if (start - i) % -step == 0:
+                        yield temp.value
+                    temp = temp.prev
+            else:
+                # walk the span forwards, then hand it out backwards
+                span = []
+                temp = self.get(stop + 1)
+                for _ in range(stop + 1, start + 1):
+                    span.append(temp.value)
+                    temp = temp.next
+                yield from span[::step]
+
+    def extend(self, values):
+        # Links the new nodes directly instead of calling append() for each value
+        if values is self:
+            values = list(values) # otherwise it would keep reading the nodes it just added
+        node_class = self.node_class
+        back_links = self.back_links
+        head = self.head
+        tail = self.tail
+        count = 0
+        for value in values:
+            new_node = node_class(value)
+            if tail is None:
+                head = new_node
+            else:
+                tail.next = new_node
+                if back_links:
+                    new_node.prev = tail
+            tail = new_node
+            count += 1
+        self.head = head
+        self.tail = tail
+        self.length += count
+        return True
+
+    def cursor(self, index = -1):
+        # Cursor on the node at index, -1 = before the head
+        if index < -1 or index >= self.length:
+            return None
+        cursor = LinkedListCursor(self)
+        cursor.seek(index + 1)
+        return cursor
+
+
+class LinkedListCursor:
+    # A position in a LinkedList. Moving to the next node and editing around the current one
+    # are O(1), so a pass of edits at increasing indexes is linear overall instead of
+    # walking from the head every time like insert(i, value) and remove(i) do.
+    # index -1 is before the head, index == length is past the tail (after removing the tail).
+    # Changing the list through its own methods while a cursor is in use can leave the cursor stale
+    def __init__(self, linked_list):
+        self.list = linked_list
+        self.index = -1
+        self.node = None # current node, None before the head and past the tail
+        self.previous = None # node before the current one, a singly linked list needs it to unlink the current node
+
+    @property
+    def value(self):
+        return self.node.value if self.node is not None else None
+
+    def next(self):
+        if self.index >= self.list.length - 1:
+            return False
+        self.__forward(1)
+        return True
+
+    def __forward(self, steps):
+        node = self.node
+        previous = self.previous
+        for _ in range(steps):
+            previous = node
+            node = node.next if node is not None else self.list.head
+        self.node = node
+        self.previous = previous
+        self.index += steps
+
+    def seek(self, offset):
+        # Moves offset nodes forward (or backward if negative) from the current one
+        target = self.index + offset
+        if target < -1 or target >= self.list.length:
+            return False
+        if offset >= 0:
+            self.__forward(offset)
+            return True
+        if self.list.back_links:
+            for _ in range(-offset):
+                self.node = self.previous
+                self.previous = self.node.prev if self.node is not None else None
+        else:
+            # no way back without prev pointers, walk again from the head
+            self.node = None
+            self.previous = None
+            self.index = -1
+            self.__forward(target + 1)
+        self.index = target
+        return True
+
+    def insert_after(self, value):
+        # Before the head this inserts at the front, the cursor doesn't move either way
+        linked_list = self.list
+        if self.index >= linked_list.length:
+            return False
+        if self.node is None:
+            return linked_list.prepend(value)
+        if self.node is linked_list.tail:
+            return linked_list.append(value)
+        new_node = linked_list.node_class(value)
+        new_node.next = self.node.next
+        self.node.next = new_node
+        if linked_list.back_links:
+            new_node.prev = self.node
+            new_node.next.prev = new_node
+        linked_list.length += 1
+        return True
+
+    def remove_current(self):
+        # Removes and returns the current node, the cursor moves on to the node after it
+        linked_list = self.list
+        temp = self.node
+        if temp is None:
+            return None
+        if self.previous is None:
+            linked_list.pop_first()
+            self.node = linked_list.head
+            return temp
+        self.previous.next = temp.next
+        if temp is linked_list.tail:
+            linked_list.tail = self.previous
+        elif linked_list.back_links:
+            temp.next.prev = self.previous
+        self.node = temp.next
+        temp.next = None
+        if linked_list.back_links:
+            temp.prev = None
+        linked_list.length -= 1
+        return temp
+
+
+def benchmark_sequential_insert(sizes = (1000, 4000, 100000), walk_limit = 10000):
+    # Insert a new value after every value of an n value list, so the positions go up:
+    # insert(i, value) walks from the head each time (O(n^2) in total), a cursor just steps along.
+    # insert(i, value) is skipped above walk_limit
+    import time
+
+    print("Inserting after every value:")
+    last_walk = last_n = None # last measured insert(i, value) run, to estimate the skipped ones from
+    for n in sizes:
+        line = f"  n = {n:>8}:"
+        linked_list = LinkedList(0)
+        linked_list.extend(range(1, n))
+        if n <= walk_limit:
+            start = time.perf_counter()
+            for i in range(n):
+                linked_list.insert(2 * i + 1, -i)
+            last_walk, last_n = time.perf_counter() - start, n
+            line += f"  insert(i, value) {last_walk:.4f}s"
+        else:
+            estimate = f", ~{last_walk * (n / last_n) ** 2:.0f}s estimated" if last_walk is not None else ""
+            line += f"  insert(i, value) skipped (O(n^2){estimate})"
+        linked_list = LinkedList(0)
+        linked_list.extend(range(1, n))
+        start = time.perf_counter()
+        cursor = linked_list.cursor(0)
+        for i in range(n):
+            cursor.insert_after(-i)
+            cursor.seek(2)
+        line += f"  cursor {time.perf_counter() - start:.4f}s"
+        print(line)
+
+
+def benchmark_drain(sizes = (1000, 4000, 100000), walk_limit = 10000):
+    # Time to empty a list with pop() from the back: walking from head (the default)
+    # vs back_links. Walking is O(n^2) for the whole drain, so it's skipped above walk_limit
+    import time
+
+    print("Draining a list with pop():")
+    last_walk = last_n = None # last measured walk, to estimate the skipped ones from
+    for n in sizes:
+        line = f"  n = {n:>8}:"
+        for back_links in (False, True):
+            if not back_links and n > walk_limit:
+                estimate = f", ~{last_walk * (n / last_n) ** 2:.0f}s estimated" if last_walk is not None else ""
+                line += f"  walk from head skipped (O(n^2){estimate})"
+                continue
+            linked_list = LinkedList(0, back_links = back_links)
+            for i in range(1, n):
+                linked_list.append(i)
+            start = time.perf_counter()
+            while linked_list.pop() is not None:
+                pass
+            elapsed = time.perf_counter() - start
+            if back_links:
+                line += f"  back_links {elapsed:.4f}s"
+            else:
+                last_walk, last_n = elapsed, n
+                line += f"  walk from head {elapsed:.4f}s"
+        print(line)
+
+
 def check(expect, actual, message):
     print(message)
     print("EXPECTED:", expect)
@@ -297,4 +659,154 @@ if __name__ == "__main__":
     print('\nRemoved node:')
     print(my_linked_list.remove(2).value)
     print('LL after remove() of last node:')
-    my_linked_list.print_list()
\ No newline at end of file
+    my_linked_list.print_list()
+
+    print("\n----- Test: Back links -----\n")
+    def values_of(linked_list):
+        # walks forward (and backward with back_links), so a wrong tail or broken prev pointers show up as a mismatch
+        forward, temp = [], linked_list.head
+        while temp is not None:
+            forward.append(temp.value)
+            temp = temp.next
+        if linked_list.length and linked_list.tail.value != forward[-1]:
+            return (forward, "tail", linked_list.tail.value)
+        if not linked_list.back_links:
+            return forward
+        backward, temp = [], linked_list.tail
+        while temp is not None:
+            backward.append(temp.value)
+            temp = temp.prev
+        return forward if forward == backward[::-1] else (forward, backward)
+    linked_list = LinkedList(2, back_links = True)
+    linked_list.append(3)
+    linked_list.prepend(1)
+    linked_list.append(5)
+    linked_list.insert(3, 4)
+    check([1, 2, 3, 4, 5], values_of(linked_list), "Append, prepend and insert keep prev pointers:")
+    check(4, linked_list.get(3).value, "Get from the tail side:")
+    check(3, linked_list.remove(2).value, "Remove from the middle:")
+    check([1, 2, 4, 5], values_of(linked_list), "List after remove:")
+    check(5, linked_list.pop().value, "Pop:")
+    check(1, linked_list.pop_first().value, "Pop first:")
+    check([2, 4], values_of(linked_list), "List after pop and pop_first:")
+    check(4, linked_list.pop().value, "Pop:")
+    check(2, linked_list.pop().value, "Pop last node:")
+    check((None, None, 0), (linked_list.head, linked_list.tail, linked_list.length), "Empty list:")
+    check(None, linked_list.pop(), "Pop on empty list:")
+    linked_list.append(7)
+    check([7], values_of(linked_list), "Append after emptying:")
+
+    print("\n----- Test: Reverse, reverse_between, reverse_k_group and rotate -----\n")
+    def build(n, back_links = False):
+        linked_list = LinkedList(0, back_links = back_links)
+        for i in range(1, n):
+            linked_list.append(i)
+        return linked_list
+    for back_links in (False, True):
+        mode = "back links" if back_links else "singly linked"
+        linked_list = build(5, back_links)
+        nodes = [linked_list.get(i) for i in range(5)]
+        linked_list.reverse()
+        check([4, 3, 2, 1, 0], values_of(linked_list), f"Reverse ({mode}):")
+        check(True, all(linked_list.get(4 - i) is node for i, node in enumerate(nodes)), f"Reverse relinks the same nodes ({mode}):")
+        linked_list = build(1, back_links)
+        linked_list.reverse()
+        check([0], values_of(linked_list), f"Reverse one node ({mode}):")
+        linked_list = build(6, back_links)
+        check(True, linked_list.reverse_between(1, 4), f"Reverse between 1 and 4 ({mode}):")
+        check([0, 4, 3, 2, 1, 5], values_of(linked_list), f"List after reverse_between(1, 4) ({mode}):")
+        linked_list.reverse_between(0, 5)
+        check([5, 1, 2, 3, 4, 0], values_of(linked_list), f"Reverse between the ends ({mode}):")
+        linked_list.reverse_between(3, 5)
+        check([5, 1, 2, 0, 4, 3], values_of(linked_list), f"Reverse a run ending at the tail ({mode}):")
+        check(False, linked_list.reverse_between(2, 6), f"Reverse between past the end ({mode}):")
+        linked_list = build(8, back_links)
+        linked_list.reverse_k_group(3)
+        check([2, 1, 0, 5, 4, 3, 6, 7], values_of(linked_list), f"Reverse in groups of 3 ({mode}):")
+        linked_list = build(6, back_links)
+        linked_list.reverse_k_group(2)
+        check([1, 0, 3, 2, 5, 4], values_of(linked_list), f"Reverse in groups of 2 ({mode}):")
+        linked_list = build(5, back_links)
+        linked_list.rotate(2)
+        check([3, 4, 0, 1, 2], values_of(linked_list), f"Rotate right by 2 ({mode}):")
+        linked_list.rotate(-2)
+        check([0, 1, 2, 3, 4], values_of(linked_list), f"Rotate left by 2 ({mode}):")
+        linked_list.rotate(11)
+        check([4, 0, 1, 2, 3], values_of(linked_list), f"Rotate by more than the length ({mode}):")
+        linked_list.append(5)
+        check([4, 0, 1, 2, 3, 5], values_of(linked_list), f"Append after rotate ({mode}):")
+
+    print("\n----- Test: Sequence protocol -----\n")
+    values = list(range(6))
+    for back_links in (False, True):
+        mode = "back links" if back_links else "singly linked"
+        linked_list = LinkedList(0, back_links = back_links)
+        linked_list.extend(range(1, 6))
+        check(values, values_of(linked_list), f"Extend ({mode}):")
+        check(values, list(linked_list), f"Iterate ({mode}):")
+        check(6, len(linked_list), f"Length ({mode}):")
+        check(values[::-1], list(reversed(linked_list)), f"Reversed ({mode}):")
+        check((0, 3, 5, 4), (linked_list[0], linked_list[3], linked_list[-1], linked_list[-2]), f"Indexing ({mode}):")
+        try:
+            linked_list[-7]
+            check(IndexError, None, f"Index before the start ({mode}):")
+        except IndexError:
+            check(IndexError, IndexError, f"Index before the start ({mode}):")
+        for index in [slice(1, 4), slice(None, None, 2), slice(4, None), slice(None, None, -1), slice(5, 1, -2), slice(-2, None), slice(3, 3), slice(4, 1)]:
+            check(values[index], list(linked_list[index]), f"Slice {index} ({mode}):")
+        sliced = linked_list[::-2]
+        check((LinkedList, back_links, [5, 3, 1]), (type(sliced), sliced.back_links, values_of(sliced)), f"Slice is a new LinkedList ({mode}):")
+        linked_list.extend(linked_list)
+        check(values + values, values_of(linked_list), f"Extend with itself ({mode}):")
+        linked_list = LinkedList(1, back_links = back_links)
+        linked_list.pop()
+        linked_list.extend(iter([7, 8]))
+        check([7, 8], values_of(linked_list), f"Extend an empty list from an iterator ({mode}):")
+
+    print("\n----- Test: Cursor -----\n")
+    for back_links in (False, True):
+        mode = "back links" if back_links else "singly linked"
+        linked_list = LinkedList(0, back_links = back_links)
+        linked_list.extend(range(1, 5))
+        cursor = linked_list.cursor()
+        check((-1, None), (cursor.index, cursor.value), f"New cursor is before the head ({mode}):")
+        check(True, cursor.insert_after("a"), f"Insert after before the head ({mode}):")
+        check(True, cursor.next(), f"Next ({mode}):")
+        check((0, "a"), (cursor.index, cursor.value), f"Cursor on the new head ({mode}):")
+        cursor.seek(2)
+        check((2, 1), (cursor.index, cursor.value), f"Seek forward ({mode}):")
+        cursor.insert_after("b")
+        check(["a", 0, 1, "b", 2, 3, 4], values_of(linked_list), f"Insert after in the middle ({mode}):")
+        cursor.seek(-2)
+        check((0, "a"), (cursor.index, cursor.value), f"Seek backward ({mode}):")
+        check("a", cursor.remove_current().value, f"Remove the head ({mode}):")
+        check((0, 0), (cursor.index, cursor.value), f"Cursor moves to the next node ({mode}):")
+        cursor.seek(2)
+        check("b", cursor.remove_current().value, f"Remove in the middle ({mode}):")
+        check(2, cursor.value, f"Cursor moves to the next node ({mode}):")
+        check([0, 1, 2, 3, 4], values_of(linked_list), f"List after removes ({mode}):")
+        check(False, cursor.seek(3), f"Seek past the tail ({mode}):")
+        cursor.seek(2)
+        check(False, cursor.next(), f"Next at the tail ({mode}):")
+        cursor.insert_after(5)
+        check([0, 1, 2, 3, 4, 5], values_of(linked_list), f"Insert after the tail ({mode}):")
+        cursor.next()
+        check(5, cursor.remove_current().value, f"Remove the tail ({mode}):")
+        check((5, None), (cursor.index, cursor.value), f"Cursor is past the tail ({mode}):")
+        check((False, None), (cursor.insert_after(6), cursor.remove_current()), f"Nothing to edit past the tail ({mode}):")
+        check([0, 1, 2, 3, 4], values_of(linked_list), f"List after removing the tail ({mode}):")
+        cursor.seek(-3)
+        check(2, cursor.value, f"Seek back from past the tail ({mode}):")
+        cursor = linked_list.cursor(0)
+        while cursor.value is not None:
+            cursor.remove_current()
+        check(([], None, None, 0), (values_of(linked_list), linked_list.head, linked_list.tail, len(linked_list)), f"Remove everything through a cursor ({mode}):")
+        check(None, linked_list.cursor(0), f"Cursor past the end of the list ({mode}):")
+        linked_list.cursor().insert_after(9)
+        check([9], values_of(linked_list), f"Insert into an empty list ({mode}):")
+
+    print("\n----- Benchmark: Drain -----\n")
+    benchmark_drain()
+
+    print("\n----- Benchmark: Sequential insert -----\n")
+    benchmark_sequential_insert()
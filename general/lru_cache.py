@@ -0,0 +1,242 @@
+# LRU Cache (Least Recently Used)
+
+# A cache with a limited size: when it's full, the entry that was used
+# longest ago gets thrown out (evicted) to make room.
+
+# Built from two structures we already have:
+# HashTable - finds the entry for a key in O(1)
+# DoublyLinkedList - keeps the entries in order of use: head = least recently used,
+# tail = most recently used. Since the hash table gives us the Node itself,
+# moving it to the tail or unlinking it is O(1) (no walking to an index)
+
+# Optional extras:
+# max_bytes - evict until the total size of the values fits (sizes from sys.getsizeof by default)
+# ttl - seconds an entry stays valid, expired entries count as misses
+
+# Big O
+# get: O(1)
+# put: O(1) (plus one O(1) step per evicted entry)
+
+import sys
+import time
+
+from doublylinked_list import DoublyLinkedList, Node
+from hash_tables import HashTable
+
+
+class CacheNode(Node):
+    def __init__(self, key, value, size, expires):
+        super().__init__(key) # node.value holds the key, so eviction knows what to delete from the table
+        self.data = value
+        self.size = size
+        self.expires = expires # clock time the entry stops being valid, None = never
+
+
+class LRUCache:
+    def __init__(self, capacity = 128, max_bytes = None, ttl = None, sizeof = sys.getsizeof, clock = time.monotonic):
+        self.capacity = capacity # max number of entries
+        self.max_bytes = max_bytes # None = no byte limit
+        self.ttl = ttl # default time to live in seconds, None = entries never expire
+        self.sizeof = sizeof
+        self.clock = clock
+        self.table = HashTable()
+        self.order = DoublyLinkedList(None)
+        self.order.pop() # the list class always starts with one node, we want it empty
+        self.bytes = 0
+        # Counters for monitoring
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0 # thrown out to stay within capacity / max_bytes
+        self.expirations = 0 # thrown out because the ttl ran out
+
+    def __len__(self):
+        return len(self.table)
+
+    def __expired(self, node):
+        return node.expires is not None and node.expires <= self.clock()
+
+    def __remove(self, node):
+        self.order.remove_node(node)
+        self.table.delete_item(node.value)
+        self.bytes -= node.size
+
+    def __contains__(self, key):
+        node = self.table.get_item(key)
+        return node is not None and not self.__expired(node)
+
+    def get(self, key, default = None):
+        node = self.table.get_item(key)
+        if node is None:
+            self.misses += 1
+            return default
+        if self.__expired(node):
+            self.__remove(node)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self.order.remove_node(node) # mark as most recently used
+        self.order.append_node(node)
+        self.hits += 1
+        return node.data
+
+    def put(self, key, value, ttl = None):
+        ttl = ttl if ttl is not None else self.ttl
+        expires = self.clock() + ttl if ttl is not None else None
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        node = self.table.get_item(key)
+        if node is not None: # update an existing entry
+            self.bytes += size - node.size
+            node.data, node.size, node.expires = value, size, expires
+            self.order.remove_node(node)
+            self.order.append_node(node)
+        else:
+            node = CacheNode(key, value, size, expires)
+            self.table.set_item(key, node)
+            self.order.append_node(node)
+            self.bytes += size
+        # Evict from the least recently used end until we fit
+        while self.order.length > self.capacity or (self.max_bytes is not None and self.bytes > self.max_bytes):
+            self.__remove(self.order.head)
+            self.evictions += 1
+
+    def delete(self, key):
+        node = self.table.get_item(key)
+        if node is None:
+            return False
+        self.__remove(node)
+        return True
+
+    def purge_expired(self):
+        # get() only notices an expired entry when it's asked for,
+        # this walks the whole cache and drops every expired one - O(n)
+        removed = 0
+        temp = self.order.head
+        while temp is not None:
+            after = temp.next
+            if self.__expired(temp):
+                self.__remove(temp)
+                self.expirations += 1
+                removed += 1
+            temp = after
+        return removed
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self),
+            "bytes": self.bytes,
+        }
+
+
+def benchmark_zipf(requests = 200000, key_space = 100000, capacity = 1000, skew = 1.1):
+    # Zipfian workload: key k is requested with weight 1 / k ** skew, so a few keys
+    # are very hot and most are rare - like real cache traffic.
+    # Same capacity for every cache, a miss "loads" the value and stores it
+    import functools
+    import random
+    from collections import OrderedDict
+
+    weights = [1 / k ** skew for k in range(1, key_space + 1)]
+    keys = random.choices(range(key_space), weights = weights, k = requests)
+
+    def run_lru_cache():
+        cache = LRUCache(capacity = capacity)
+        for key in keys:
+            if cache.get(key) is None:
+                cache.put(key, key * 2)
+        return cache.hits
+
+    def run_ordered_dict():
+        cache = OrderedDict()
+        hits = 0
+        for key in keys:
+            if key in cache:
+                cache.move_to_end(key)
+                hits += 1
+            else:
+                cache[key] = key * 2
+                if len(cache) > capacity:
+                    cache.popitem(last = False)
+        return hits
+
+    def run_functools():
+        @functools.lru_cache(maxsize = capacity)
+        def load(key):
+            return key * 2
+        for key in keys:
+            load(key)
+        return load.cache_info().hits
+
+    print(f"{requests} Zipf(s={skew}) requests over {key_space} keys, capacity {capacity}:")
+    for label, run in (("LRUCache", run_lru_cache), ("OrderedDict", run_ordered_dict), ("functools.lru_cache", run_functools)):
+        start = time.perf_counter()
+        hits = run()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:>19}: hit rate {hits / requests:.3f}  {requests / elapsed / 1e6:.2f}M requests/s")
+
+
+def check(expect, actual, message):
+    print(message)
+    print("EXPECTED:", expect)
+    print("RETURNED:", actual)
+    print("PASS" if expect == actual else "FAIL", "\n")
+
+
+if __name__ == "__main__":
+    print("\n----- Test: Get and Put -----\n")
+    cache = LRUCache(capacity = 2)
+    cache.put("bolts", 1400)
+    cache.put("nuts", 300)
+    check(1400, cache.get("bolts"), "Get bolts:")
+    check(None, cache.get("caps"), "Get a missing key:")
+    cache.put("nuts", 350)
+    check(350, cache.get("nuts"), "Get nuts after update:")
+    check(2, len(cache), "Len after an update:")
+
+    print("\n----- Test: Least Recently Used Is Evicted -----\n")
+    cache = LRUCache(capacity = 2)
+    cache.put("bolts", 1400)
+    cache.put("nuts", 300)
+    cache.get("bolts") # bolts is now more recent than nuts
+    cache.put("washers", 50)
+    check(False, "nuts" in cache, "Nuts was evicted:")
+    check(True, "bolts" in cache and "washers" in cache, "Bolts and washers stay:")
+    check(1, cache.evictions, "Eviction count:")
+
+    print("\n----- Test: Byte Size Limit -----\n")
+    cache = LRUCache(capacity = 100, max_bytes = 10, sizeof = len)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    cache.put("c", "xxxx") # 12 bytes > 10, "a" goes
+    check(False, "a" in cache, "Oldest entry evicted by the byte limit:")
+    check(8, cache.bytes, "Bytes after eviction:")
+    cache.put("b", "x")
+    check(5, cache.bytes, "Bytes after shrinking a value:")
+
+    print("\n----- Test: Time To Live -----\n")
+    now = [0.0]
+    cache = LRUCache(ttl = 10, clock = lambda: now[0])
+    cache.put("bolts", 1400)
+    cache.put("nuts", 300, ttl = 100)
+    now[0] = 5.0
+    check(1400, cache.get("bolts"), "Get bolts before it expires:")
+    now[0] = 10.0
+    check(None, cache.get("bolts"), "Get bolts after it expires:")
+    check(300, cache.get("nuts"), "Nuts has its own longer ttl:")
+    cache.put("washers", 50, ttl = 1)
+    now[0] = 20.0
+    check(1, cache.purge_expired(), "Purge removes washers:")
+    check(1, len(cache), "Len after purge:")
+
+    print("\n----- Test: Stats -----\n")
+    stats = cache.stats()
+    check((2, 1, 2), (stats["hits"], stats["misses"], stats["expirations"]), "Hits, misses and expirations:")
+    check(2 / 3, stats["hit_rate"], "Hit rate:")
+
+    print("\n----- Benchmark: Zipfian Workload -----\n")
+    benchmark_zipf()
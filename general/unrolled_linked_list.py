@@ -0,0 +1,408 @@
+# Unrolled Linked List
+
+# A linked list where every node holds up to node_capacity values in a small
+# Python list instead of a single value. Same append / prepend / insert / remove /
+# get API as LinkedList, but far fewer node objects:
+# - memory: one node (and one small list) per node_capacity values instead of one node per value
+# - speed: iterating mostly walks a list's contiguous block of pointers, and there are
+#   node_capacity times fewer next pointers to follow when looking for an index
+
+# Differences from LinkedList: there are no per-value Nodes to hand out, so get, remove,
+# pop and pop_first return the value itself.
+
+# Nodes are linked both ways (like DoublyLinkedList), so pop is O(1) and an index in the
+# back half is found from the tail.
+# A full node is split in two on insert, a node that drops below half full
+# after a remove takes values from (or merges with) the node after it.
+
+# Big O (n values, c = node_capacity)
+# append, pop: O(1)
+# prepend, pop_first: O(c)
+# get, set_value, insert, remove: O(n / c + c)
+
+from itertools import chain
+
+
+class UnrolledNode:
+    __slots__ = ("values", "next", "prev")
+
+    def __init__(self, values):
+        self.values = values
+        self.next = None
+        self.prev = None
+
+    def print_node(self):
+        print(f"UnrolledNode({self.values})")
+
+
+class UnrolledLinkedList:
+    def __init__(self, value, node_capacity = 32):
+        self.node_capacity = node_capacity
+        new_node = UnrolledNode([value])
+        self.head = new_node
+        self.tail = new_node
+        self.length = 1
+
+    def print_list(self):
+        blocks = []
+        temp = self.head
+        while temp is not None:
+            blocks.append(str(temp.values))
+            temp = temp.next
+        blocks.append("None")
+        print(" -> ".join(blocks))
+
+    def __link_after(self, node, new_node):
+        # Links new_node after node, node = None links it in as the head
+        if node is None:
+            new_node.next = self.head
+            if self.head is not None:
+                self.head.prev = new_node
+            self.head = new_node
+        else:
+            new_node.prev = node
+            new_node.next = node.next
+            if node.next is not None:
+                node.next.prev = new_node
+            node.next = new_node
+        if new_node.next is None:
+            self.tail = new_node
+
+    def __unlink(self, node):
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+        node.next = None
+        node.prev = None
+
+    def __locate(self, index):
+        # Node holding index and the position inside it, walking from the nearer end
+        if index < self.length // 2:
+            temp = self.head
+            while index >= len(temp.values):
+                index -= len(temp.values)
+                temp = temp.next
+            return temp, index
+        index = self.length - 1 - index # counted from the back
+        temp = self.tail
+        while index >= len(temp.values):
+            index -= len(temp.values)
+            temp = temp.prev
+        return temp, len(temp.values) - 1 - index
+
+    def append(self, value):
+        if self.tail is not None and len(self.tail.values) < self.node_capacity:
+            self.tail.values.append(value)
+        else:
+            self.__link_after(self.tail, UnrolledNode([value]))
+        self.length += 1
+        return True
+
+    def pop(self):
+        if self.length == 0:
+            return None
+        value = self.tail.values.pop()
+        if not self.tail.values:
+            self.__unlink(self.tail)
+        self.length -= 1
+        return value
+
+    def prepend(self, value):
+        if self.head is not None and len(self.head.values) < self.node_capacity:
+            self.head.values.insert(0, value)
+        else:
+            self.__link_after(None, UnrolledNode([value]))
+        self.length += 1
+        return True
+
+    def pop_first(self):
+        if self.length == 0:
+            return None
+        value = self.head.values.pop(0)
+        if not self.head.values:
+            self.__unlink(self.head)
+        self.length -= 1
+        return value
+
+    def get(self, index):
+        if index < 0 or index >= self.length:
+            return None
+        node, offset = self.__locate(index)
+        return node.values[offset]
+
+    def set_value(self, index, value):
+        if index < 0 or index >= self.length:
+            return False
+        node, offset = self.__locate(index)
+        node.values[offset] = value
+        return True
+
+    def insert(self, index, value):
+        if index < 0 or index > self.length:
+            return False
+        if index == 0:
+            return self.prepend(value)
+        if index == self.length:
+            return self.append(value)
+        node, offset = self.__locate(index)
+        if len(node.values) >= self.node_capacity:
+            # split: the back half moves to a new node after this one
+            half = len(node.values) // 2
+            self.__link_after(node, UnrolledNode(node.values[half:]))
+            del node.values[half:]
+            if offset > half:
+                node = node.next
+                offset -= half
+        node.values.insert(offset, value)
+        self.length += 1
+        return True
+
+    def remove(self, index):
+        if index < 0 or index >= self.length:
+            return None
+        node, offset = self.__locate(index)
+        value = node.values.pop(offset)
+        self.length -= 1
+        if not node.values:
+            self.__unlink(node)
+        elif len(node.values) < self.node_capacity // 2 and node.next is not None:
+            after = node.next
+            if len(node.values) + len(after.values) <= self.node_capacity:
+                # merge the next node into this one
+                node.values.extend(after.values)
+                self.__unlink(after)
+            else:
+                # borrow from the next node until this one is half full again
+                moved = self.node_capacity // 2 - len(node.values)
+                node.values.extend(after.values[:moved])
+                del after.values[:moved]
+        return value
+
+    # Sequence protocol, same as LinkedList
+
+    def _empty_like(self):
+        new_list = self.__class__(None, node_capacity = self.node_capacity)
+        new_list.pop_first()
+        return new_list
+
+    def __len__(self):
+        return self.length
+
+    def __blocks(self):
+        temp = self.head
+        while temp is not None:
+            yield temp.values
+            temp = temp.next
+
+    def __iter__(self):
+        # chain hands out the values of each block in C, Python code only runs once per node
+        return chain.from_iterable(self.__blocks())
+
+    def __reversed__(self):
+        temp = self.tail
+        while temp is not None:
+            yield from reversed(temp.values)
+            temp = temp.prev
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            result = self._empty_like()
+            start, stop, step = index.indices(self.length)
+            if (step > 0 and start < stop) or (step < 0 and start > stop):
+                low, high = (start, stop) if step > 0 else (stop + 1, start + 1)
+                result.extend(self.__span(low, high)[::step])
+            return result
+        if index < 0:
+            index += self.length
+        if index < 0 or index >= self.length:
+            raise IndexError("linked list index out of range")
+        node, offset = self.__locate(index)
+        return node.values[offset]
+
+    def __span(self, start, stop):
+        # Values from index start up to stop, walking only the nodes that hold them
+        node, offset = self.__locate(start)
+        span = node.values[offset:offset + stop - start]
+        while len(span) < stop - start:
+            node = node.next
+            span.extend(node.values[:stop - start - len(span)])
+        return span
+
+    def extend(self, values):
+        # Fills the tail node, then adds full nodes
+        if values is self:
+            values = list(values)
+        capacity = self.node_capacity
+        values = iter(values)
+        if self.tail is not None and len(self.tail.values) < capacity:
+            room = capacity - len(self.tail.values)
+            before = len(self.tail.values)
+            for value in values:
+                self.tail.values.append(value)
+                room -= 1
+                if room == 0:
+                    break
+            self.length += len(self.tail.values) - before
+        while True:
+            block = []
+            for value in values:
+                block.append(value)
+                if len(block) == capacity:
+                    break
+            if not block:
+                return True
+            self.__link_after(self.tail, UnrolledNode(block))
+            self.length += len(block)
+
+
+def benchmark_memory(n = 100000, capacities = (16, 64)):
+    # Memory per value and iteration speed: Python list vs one node per value vs unrolled.
+    # The values are created before measuring, so only the structure itself is counted
+    import time
+    import tracemalloc
+    from doublylinked_list import DoublyLinkedList
+    from linked_list import LinkedList
+
+    values = list(range(n))
+
+    def build_list():
+        return list(values)
+
+    def build_linked(linked_class):
+        def build():
+            linked_list = linked_class(values[0])
+            for value in values[1:]:
+                linked_list.append(value)
+            return linked_list
+        return build
+
+    def build_unrolled(capacity):
+        def build():
+            unrolled = UnrolledLinkedList(values[0], node_capacity = capacity)
+            unrolled.extend(values[1:])
+            return unrolled
+        return build
+
+    structures = [("list", build_list), ("LinkedList", build_linked(LinkedList)), ("DoublyLinkedList", build_linked(DoublyLinkedList))]
+    structures += [(f"Unrolled (capacity {capacity})", build_unrolled(capacity)) for capacity in capacities]
+    print(f"{n} values:")
+    for label, build in structures:
+        tracemalloc.start()
+        structure = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for _ in structure:
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"  {label:>24}: {size / n:6.1f} bytes per value  iteration {n / elapsed / 1e6:6.1f}M values/s")
+        structure = None
+
+
+def check(expect, actual, message):
+    print(message)
+    print("EXPECTED:", expect)
+    print("RETURNED:", actual)
+    print("PASS" if expect == actual else "FAIL", "\n")
+
+
+if __name__ == "__main__":
+    def blocks_of(unrolled):
+        # node contents front to back, checks the prev pointers, length and tail on the way
+        blocks, temp, previous = [], unrolled.head, None
+        while temp is not None:
+            if temp.prev is not previous:
+                return "broken prev pointer"
+            blocks.append(list(temp.values))
+            previous, temp = temp, temp.next
+        if previous is not unrolled.tail or sum(len(block) for block in blocks) != unrolled.length:
+            return "wrong tail or length"
+        return blocks
+
+    print("\n----- Test: Append, prepend and pop -----\n")
+    unrolled = UnrolledLinkedList(2, node_capacity = 4)
+    for value in [3, 4, 5, 6]:
+        unrolled.append(value)
+    unrolled.prepend(1)
+    unrolled.prepend(0)
+    unrolled.print_list()
+    check([[0, 1], [2, 3, 4, 5], [6]], blocks_of(unrolled), "Nodes after appends and prepends:")
+    check(6, unrolled.pop(), "Pop:")
+    check(0, unrolled.pop_first(), "Pop first:")
+    check([[1], [2, 3, 4, 5]], blocks_of(unrolled), "Empty nodes are unlinked:")
+    for _ in range(5):
+        unrolled.pop()
+    check((None, None, 0), (unrolled.head, unrolled.tail, unrolled.length), "Empty list:")
+    check((None, None), (unrolled.pop(), unrolled.pop_first()), "Pop on empty list:")
+    unrolled.prepend(7)
+    check([[7]], blocks_of(unrolled), "Prepend to an empty list:")
+
+    print("\n----- Test: Get, set_value, insert and remove -----\n")
+    unrolled = UnrolledLinkedList(0, node_capacity = 4)
+    unrolled.extend(range(1, 8))
+    check([[0, 1, 2, 3], [4, 5, 6, 7]], blocks_of(unrolled), "Extend fills whole nodes:")
+    check([0, 3, 4, 7, None, None], [unrolled.get(i) for i in [0, 3, 4, 7, 8, -1]], "Get:")
+    check(True, unrolled.set_value(5, 50), "Set value:")
+    check(50, unrolled.get(5), "Get after set value:")
+    check(True, unrolled.insert(3, "a"), "Insert into a full node:")
+    check([[0, 1], [2, "a", 3], [4, 50, 6, 7]], blocks_of(unrolled), "Full node is split:")
+    unrolled.insert(8, "b")
+    check([[0, 1], [2, "a", 3], [4, 50], [6, "b", 7]], blocks_of(unrolled), "Split with the value going into the new node:")
+    check(False, unrolled.insert(12, "c"), "Insert past the end:")
+    check(0, unrolled.remove(0), "Remove:")
+    check([[1, 2, "a", 3], [4, 50], [6, "b", 7]], blocks_of(unrolled), "Node under half full merges with the next one:")
+    check(None, unrolled.remove(9), "Remove past the end:")
+    for _ in range(9):
+        unrolled.remove(0)
+    check((None, None, 0), (unrolled.head, unrolled.tail, unrolled.length), "Remove everything:")
+    unrolled = UnrolledLinkedList(2, node_capacity = 4)
+    unrolled.extend([3, 4, 5])
+    unrolled.prepend(1)
+    unrolled.prepend(0)
+    check(0, unrolled.remove(0), "Remove:")
+    check([[1, 2], [3, 4, 5]], blocks_of(unrolled), "Node under half full borrows from a next node too full to merge:")
+
+    print("\n----- Test: Sequence protocol -----\n")
+    values = list(range(20))
+    unrolled = UnrolledLinkedList(0, node_capacity = 3)
+    unrolled.extend(range(1, 20))
+    check(values, list(unrolled), "Iterate:")
+    check(values[::-1], list(reversed(unrolled)), "Reversed:")
+    check((20, 7, 19), (len(unrolled), unrolled[7], unrolled[-1]), "Len and indexing:")
+    for index in [slice(2, 11), slice(None, None, 4), slice(17, 3, -3), slice(5, 5), slice(None, None, -1)]:
+        check(values[index], list(unrolled[index]), f"Slice {index}:")
+    try:
+        unrolled[20]
+        check(IndexError, None, "Index past the end:")
+    except IndexError:
+        check(IndexError, IndexError, "Index past the end:")
+
+    print("\n----- Test: Same results as LinkedList -----\n")
+    import random
+    from linked_list import LinkedList
+    rng = random.Random(7)
+    unrolled = UnrolledLinkedList(0, node_capacity = 8)
+    linked_list = LinkedList(0)
+    for step in range(3000):
+        operation = rng.choice(["append", "prepend", "insert", "insert", "remove", "remove", "pop", "pop_first"])
+        index = rng.randrange(-1, len(linked_list) + 2)
+        if operation == "append":
+            unrolled.append(step), linked_list.append(step)
+        elif operation == "prepend":
+            unrolled.prepend(step), linked_list.prepend(step)
+        elif operation == "insert":
+            unrolled.insert(index, step), linked_list.insert(index, step)
+        else:
+            args = (index,) if operation == "remove" else ()
+            getattr(unrolled, operation)(*args), getattr(linked_list, operation)(*args)
+    check(list(linked_list), list(unrolled), "3000 random operations:")
+    check(True, isinstance(blocks_of(unrolled), list), "Node links still consistent:")
+    check(True, all(len(block) <= 8 for block in blocks_of(unrolled)), "No node over capacity:")
+
+    print("\n----- Benchmark: Memory and iteration -----\n")
+    benchmark_memory()